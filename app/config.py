@@ -39,6 +39,10 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./data/voice_agent.db"
     
+    # Optional Redis session store (e.g. "redis://localhost:6379/0").
+    # When unset, sessions stay in the relational database.
+    redis_url: str = ""
+    
     # Logging
     log_level: str = "INFO"
     log_file: str = "./logs/app.log"
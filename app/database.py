@@ -3,23 +3,48 @@ Database setup and session management using SQLAlchemy
 """
 
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import StaticPool
 
 from app.config import settings
 
 # Ensure data directory exists
 os.makedirs("data", exist_ok=True)
 
-# Create engine with SQLite-specific configuration
+# Create engine with SQLite-specific configuration. A real connection
+# pool (rather than StaticPool's single shared connection) lets
+# concurrent requests read in parallel once WAL mode is on below.
 engine = create_engine(
     settings.database_url,
     connect_args={"check_same_thread": False},  # Required for SQLite
-    poolclass=StaticPool,  # Use static pool for SQLite
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=1800,  # Retire connections after 30 min
+    query_cache_size=1200,  # Room for every hot statement's compiled SQL
     echo=settings.debug  # Log SQL queries in debug mode
 )
 
+
+@event.listens_for(engine, "connect")
+def _sqlite_pragmas(dbapi_conn, _connection_record):
+    """Apply per-connection SQLite pragmas.
+
+    WAL journaling allows readers to proceed concurrently with a writer,
+    which is what makes the multi-connection pool above worthwhile.
+    synchronous=NORMAL is safe under WAL and avoids an fsync per commit.
+    mmap_size maps up to 256MB of the DB file into the process so reads
+    skip the page-cache copy; cache_size=-65536 gives each connection a
+    64MB page cache.
+    """
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.close()
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -32,6 +57,17 @@ def init_db():
     from app import models  # Import models to register them
     Base.metadata.create_all(bind=engine)
 
+    # One-time repair for rows written by the retired
+    # SQLEnum(ConversationStatus) column, which persisted member names
+    # ('ACTIVE'); statuses are stored lowercase now, and the stats
+    # queries, API filters and CHECK constraint all compare against the
+    # lowercase form. Idempotent and a no-op on clean databases.
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE conversations SET status = lower(status) "
+            "WHERE status != lower(status)"
+        )
+
 
 def get_db():
     """Dependency to get database session"""
@@ -3,17 +3,23 @@ FastAPI Application Factory
 Main entry point for the Voice Scheduling Agent
 """
 
+import hashlib
 import os
+import re
 from contextlib import asynccontextmanager
+from pathlib import Path
+
+import orjson
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from app.config import settings
 from app.database import init_db
-from app.utils.logger import setup_logging, get_logger
+from app.utils.logger import setup_logging, shutdown_logging, get_logger
 from app.routers import auth_router, websocket_router, api_router
 
 # Setup logging
@@ -21,25 +27,103 @@ setup_logging()
 logger = get_logger(__name__)
 
 
+# HTML pages cached in memory at startup: (bytes, etag) per route, so a
+# GET is a memcpy instead of a file read + decode per request
+_page_cache: dict[str, tuple[bytes, str]] = {}
+
+# The OpenAPI schema serialized once at startup; /openapi.json serves
+# these bytes instead of re-encoding the several-KB dict per request
+_openapi_cache: dict[str, bytes] = {}
+
+
+# Bare /static asset references in the HTML (no query string yet);
+# _load_page stamps each with a content-hash version so immutable
+# caching can never strand a browser on a stale asset
+_ASSET_REF_RE = re.compile(rb'/static/[A-Za-z0-9_.-]+\.(?:js|css)(?!\?)')
+
+
+def _stamp_asset_version(match: "re.Match[bytes]") -> bytes:
+    """Append ?v=<content-hash> to a /static asset reference"""
+    ref = match.group(0)
+    try:
+        body = Path(ref.decode().lstrip("/")).read_bytes()
+    except OSError:
+        # Missing asset: leave the reference alone, the 404 is clearer
+        return ref
+    digest = hashlib.blake2b(body, digest_size=6).hexdigest()
+    return b"%s?v=%s" % (ref, digest.encode())
+
+
+def _load_page(name: str) -> tuple[bytes, str]:
+    """Read a static HTML file, version its asset URLs, compute its ETag.
+
+    Asset references are rewritten to /static/x.js?v=<hash-of-x.js> at
+    load time, so a deploy that changes an asset changes the URL the
+    HTML hands out and the week-long immutable cache below starts
+    fresh; unchanged assets keep their URL and stay cached.
+    """
+    body = _ASSET_REF_RE.sub(_stamp_asset_version, Path("static", name).read_bytes())
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    return body, etag
+
+
+def _page_response(request: Request, name: str) -> Response:
+    """Serve a cached HTML page, honoring If-None-Match"""
+    if settings.debug:
+        # Pick up edits without a restart; production serves from memory
+        _page_cache[name] = _load_page(name)
+    body, etag = _page_cache[name]
+    headers = {"Cache-Control": "public, max-age=3600", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/html", headers=headers)
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that marks assets as long-lived and immutable.
+
+    The JS/CSS under /static changes only on deploys, so a week-long
+    immutable lifetime lets returning browsers skip even the
+    revalidation request. _load_page stamps every asset URL in the
+    served HTML with a ?v=<content-hash>, so a changed asset is fetched
+    under a new URL rather than waiting out the old one's lifetime.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault(
+            "Cache-Control", "public, max-age=604800, immutable"
+        )
+        return response
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
     logger.info(f"Debug mode: {settings.debug}")
-    
+
     # Initialize database
     init_db()
     logger.info("Database initialized")
-    
+
     # Ensure directories exist
     os.makedirs("data", exist_ok=True)
     os.makedirs("logs", exist_ok=True)
-    
+
+    # Preload the HTML pages served at / and /dashboard
+    _page_cache["index.html"] = _load_page("index.html")
+    _page_cache["dashboard.html"] = _load_page("dashboard.html")
+
+    # Build and serialize the OpenAPI schema once
+    _openapi_cache["bytes"] = orjson.dumps(app.openapi())
+
     yield
-    
+
     # Shutdown
     logger.info("Application shutting down")
+    shutdown_logging()
 
 
 def create_app() -> FastAPI:
@@ -70,6 +154,9 @@ def create_app() -> FastAPI:
         * **OpenAPI JSON**: `/openapi.json` - OpenAPI specification
         """,
         lifespan=lifespan,
+        # orjson serializes the datetime-heavy conversation payloads in
+        # Rust and emits bytes directly, skipping the second UTF-8 encode
+        default_response_class=ORJSONResponse,
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
@@ -96,6 +183,12 @@ def create_app() -> FastAPI:
         }
     )
     
+    # GZip middleware: conversation/message JSON is highly redundant
+    # text and compresses 5-10x. minimum_size keeps tiny responses
+    # (e.g. /api/health) uncompressed; level 5 is the sweet spot of
+    # ratio vs CPU for JSON
+    app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
     # CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -106,8 +199,24 @@ def create_app() -> FastAPI:
     )
     
     # Mount static files
-    app.mount("/static", StaticFiles(directory="static"), name="static")
+    app.mount("/static", CachedStaticFiles(directory="static"), name="static")
     
+    # Swap FastAPI's default /openapi.json route (which re-serializes
+    # the schema dict on every hit) for one that returns the bytes
+    # cached at startup
+    app.router.routes = [
+        route for route in app.router.routes
+        if getattr(route, "path", None) != "/openapi.json"
+    ]
+
+    @app.get("/openapi.json", include_in_schema=False)
+    async def openapi_json():
+        return Response(
+            content=_openapi_cache["bytes"],
+            media_type="application/json",
+            headers={"Cache-Control": "public, max-age=300"}
+        )
+
     # Include routers
     app.include_router(auth_router)
     app.include_router(websocket_router)
@@ -115,28 +224,27 @@ def create_app() -> FastAPI:
     
     # Root route - serve HTML
     @app.get("/", response_class=HTMLResponse)
-    async def root():
+    async def root(request: Request):
         """Serve the main HTML page"""
-        with open("static/index.html", "r") as f:
-            return HTMLResponse(content=f.read())
-    
+        return _page_response(request, "index.html")
+
     # Dashboard route
     @app.get("/dashboard", response_class=HTMLResponse)
-    async def dashboard():
+    async def dashboard(request: Request):
         """Serve the dashboard page"""
-        with open("static/dashboard.html", "r") as f:
-            return HTMLResponse(content=f.read())
+        return _page_response(request, "dashboard.html")
     
-    # Request logging middleware
+    # Request logging middleware. logger.info here is only a queue put;
+    # formatting and writes happen on the logging listener thread
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
         """Log all HTTP requests"""
         import time
-        start_time = time.time()
-        
+        start_time = time.perf_counter_ns()
+
         response = await call_next(request)
-        
-        duration_ms = round((time.time() - start_time) * 1000, 2)
+
+        duration_ms = round((time.perf_counter_ns() - start_time) / 1e6, 2)
         
         # Skip logging for static files and health checks
         path = request.url.path
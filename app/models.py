@@ -3,20 +3,43 @@ SQLAlchemy database models
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, CheckConstraint, Index, func
 from sqlalchemy.orm import relationship
-import enum
 
 from app.database import Base
 
 
-class ConversationStatus(enum.Enum):
-    """Status of a conversation session"""
+class ConversationStatus:
+    """Status of a conversation session.
+
+    Plain string constants rather than a Python Enum: the values are
+    stored and compared as-is, sparing the ORM an enum coercion on
+    every row load, with a CHECK constraint keeping enforcement in the
+    database.
+    """
     ACTIVE = "active"
     COMPLETED = "completed"
     ERROR = "error"
 
 
+class GoogleToken(Base):
+    """Single-user Google OAuth token store (fields mirror Credentials)"""
+    __tablename__ = "google_tokens"
+
+    id = Column(Integer, primary_key=True)
+    token = Column(Text, nullable=True)  # Short-lived access token
+    refresh_token = Column(Text, nullable=True)
+    token_uri = Column(String(255), nullable=True)
+    client_id = Column(String(255), nullable=True)
+    client_secret = Column(String(255), nullable=True)
+    scopes = Column(Text, nullable=True)  # JSON-encoded list
+    expiry = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<GoogleToken(id={self.id}, expiry={self.expiry})>"
+
+
 class User(Base):
     """User model for storing OAuth tokens and user info"""
     __tablename__ = "users"
@@ -24,12 +47,19 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=True)
     google_token_encrypted = Column(Text, nullable=True)  # Encrypted OAuth token
-    created_at = Column(DateTime, default=datetime.utcnow)
-    last_login = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
+    last_login = Column(DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
-    # Relationships
-    conversations = relationship("Conversation", back_populates="user")
-    sessions = relationship("Session", back_populates="user", cascade="all, delete-orphan")
+    # Relationships. Collections are lazy="raise_on_sql" so an
+    # accidental attribute access on a hot path fails loudly instead of
+    # silently emitting per-row SELECTs; queries that really need a
+    # collection opt in with selectinload(). Sessions are small and
+    # always wanted at auth time, so they load eagerly.
+    conversations = relationship("Conversation", back_populates="user", lazy="raise_on_sql")
+    sessions = relationship(
+        "Session", back_populates="user",
+        cascade="all, delete-orphan", lazy="selectin"
+    )
     
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email})>"
@@ -41,10 +71,10 @@ class Session(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     session_token = Column(String(64), unique=True, index=True, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    expires_at = Column(DateTime, nullable=False)
-    last_used_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    created_at = Column(DateTime, server_default=func.now())
+    expires_at = Column(DateTime, nullable=False, index=True)  # Range-scanned by cleanup_expired_sessions
+    last_used_at = Column(DateTime, server_default=func.now(), onupdate=datetime.utcnow)
     
     # Relationships
     user = relationship("User", back_populates="sessions")
@@ -56,20 +86,34 @@ class Session(Base):
 class Conversation(Base):
     """Conversation session model"""
     __tablename__ = "conversations"
-    
+    # Composite index backing keyset pagination: seek on
+    # (user_id, started_at, id) instead of scanning past OFFSET rows
+    __table_args__ = (
+        Index("ix_conversations_user_started", "user_id", "started_at", "id"),
+        CheckConstraint("status IN ('active', 'completed', 'error')"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String(64), unique=True, index=True, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    status = Column(SQLEnum(ConversationStatus), default=ConversationStatus.ACTIVE)
-    started_at = Column(DateTime, default=datetime.utcnow)
+    status = Column(String(16), default=ConversationStatus.ACTIVE, nullable=False)
+    started_at = Column(DateTime, server_default=func.now())
     ended_at = Column(DateTime, nullable=True)
     client_ip = Column(String(45), nullable=True)  # IPv6 max length
     user_agent = Column(String(500), nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="conversations")
-    messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
-    calendar_events = relationship("CalendarEvent", back_populates="conversation", cascade="all, delete-orphan")
+    messages = relationship(
+        "Message", back_populates="conversation",
+        cascade="all, delete-orphan", lazy="raise_on_sql",
+        order_by="Message.timestamp"
+    )
+    calendar_events = relationship(
+        "CalendarEvent", back_populates="conversation",
+        cascade="all, delete-orphan", lazy="raise_on_sql",
+        order_by="CalendarEvent.created_at"
+    )
     
     def __repr__(self):
         return f"<Conversation(id={self.id}, session_id={self.session_id}, status={self.status})>"
@@ -78,7 +122,12 @@ class Conversation(Base):
 class Message(Base):
     """Individual message in a conversation"""
     __tablename__ = "messages"
-    
+    # One index range scan locates a conversation's messages already in
+    # timestamp order, instead of a table scan plus sort
+    __table_args__ = (
+        Index("ix_messages_conv_ts", "conversation_id", "timestamp"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False)
     role = Column(String(20), nullable=False)  # user, assistant, system
@@ -95,7 +144,10 @@ class Message(Base):
 class CalendarEvent(Base):
     """Calendar events created through conversations"""
     __tablename__ = "calendar_events"
-    
+    __table_args__ = (
+        Index("ix_events_conv_created", "conversation_id", "created_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False)
     google_event_id = Column(String(255), nullable=True)
@@ -105,7 +157,7 @@ class CalendarEvent(Base):
     end_time = Column(DateTime, nullable=False)
     attendee_name = Column(String(255), nullable=True)
     html_link = Column(String(500), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
     
     # Relationships
     conversation = relationship("Conversation", back_populates="calendar_events")
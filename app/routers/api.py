@@ -2,19 +2,25 @@
 REST API routes for health checks, conversation history, and statistics
 """
 
-from typing import Optional, List
-from datetime import datetime
-
-from fastapi import APIRouter, Depends, HTTPException, Query, Cookie
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+import base64
+import json
+from typing import Optional, List, Tuple
+from datetime import datetime, timezone
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Cookie, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_db, SessionLocal
+from app.models import Conversation, Message
 from app.services.conversation import ConversationService
 from app.services.calendar import CalendarService
 from app.services.user import UserService
+from app.utils.session import get_cached_session_user_id, cache_session_user_id
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,9 +28,70 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/api", tags=["API"])
 
 
+def _encode_cursor(ts: datetime, row_id: int) -> str:
+    """Encode a (timestamp, id) keyset position as an opaque cursor"""
+    payload = json.dumps({"ts": ts.isoformat(), "id": row_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Decode an opaque cursor; None if absent or malformed"""
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(payload["ts"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def get_current_user_id(
+    session: str = Cookie(None),
+    db: Session = Depends(get_db)
+) -> Optional[int]:
+    """
+    Resolve the session cookie to a user ID, with a short TTL cache
+
+    Cache hits skip the sessions/users SELECTs that every endpoint was
+    repeating for the same token. Returns None for anonymous requests.
+    """
+    if not session:
+        return None
+    hit, user_id = get_cached_session_user_id(session)
+    if hit:
+        return user_id
+    user = UserService(db).get_user_from_session_token(session)
+    user_id = user.id if user else None
+    # Cache the full identity: /auth/status and the WebSocket endpoint
+    # read the email from this same shared entry, so writing it without
+    # one would have them report an anonymous user until the TTL expires
+    cache_session_user_id(session, user_id, user.email if user else None)
+    return user_id
+
+
+def get_current_user_required(
+    user_id: Optional[int] = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    Resolve the session cookie to a User, raising 401 when anonymous
+
+    Layered on get_current_user_id so it shares both FastAPI's
+    per-request dependency cache and the cross-request TTL cache.
+    """
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    user = UserService(db).get_user_by_id(user_id)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid session")
+    return user
+
+
 # ==================== Response Models ====================
 
 class HealthResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     status: str
     version: str
     timestamp: str
@@ -32,16 +99,17 @@ class HealthResponse(BaseModel):
 
 
 class MessageResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     id: int
     role: str
     content: str
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class CalendarEventResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     id: int
     google_event_id: Optional[str]
     summary: str
@@ -51,11 +119,10 @@ class CalendarEventResponse(BaseModel):
     html_link: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class ConversationResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     id: int
     session_id: str
     status: str
@@ -64,9 +131,6 @@ class ConversationResponse(BaseModel):
     message_count: int
     events_created: int
 
-    class Config:
-        from_attributes = True
-
 
 class ConversationDetailResponse(ConversationResponse):
     messages: List[MessageResponse]
@@ -74,6 +138,8 @@ class ConversationDetailResponse(ConversationResponse):
 
 
 class StatsResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     total_conversations: int
     active: int
     completed: int
@@ -83,14 +149,28 @@ class StatsResponse(BaseModel):
 
 
 class UserResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     id: int
     email: Optional[str]
     created_at: datetime
     last_login: datetime
     is_authenticated: bool
-    
-    class Config:
-        from_attributes = True
+
+
+# Build every model's pydantic-core validator and serializer now, at
+# import time, instead of lazily on the first request that touches it
+for _model in (
+    HealthResponse, MessageResponse, CalendarEventResponse,
+    ConversationResponse, ConversationDetailResponse,
+    StatsResponse, UserResponse,
+):
+    _model.model_rebuild(force=True)
+
+# Batch ORM-to-model validation: a single TypeAdapter call validates a
+# whole list inside pydantic-core rather than one constructor per row
+_MsgListAdapter = TypeAdapter(List[MessageResponse])
+_EvtListAdapter = TypeAdapter(List[CalendarEventResponse])
 
 
 # ==================== Endpoints ====================
@@ -115,23 +195,19 @@ class UserResponse(BaseModel):
     - Deployment verification
     """
 )
-async def health_check(
-    session: str = Cookie(None),
+def health_check(
+    user_id: Optional[int] = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """
     Health check endpoint for load balancers and monitoring
-    
+
     Returns service status and version information
     """
-    # Check if any user is authenticated (for backward compatibility)
-    user_service = UserService(db)
-    user = user_service.get_user_from_session_token(session) if session else None
-    
     google_calendar_status = "not_connected"
-    if user:
-        calendar_service = CalendarService(db=db, user_id=user.id)
-        google_calendar_status = "connected" if calendar_service.is_authenticated(user.id) else "not_connected"
+    if user_id:
+        calendar_service = CalendarService(db=db, user_id=user_id)
+        google_calendar_status = "connected" if calendar_service.is_authenticated(user_id) else "not_connected"
     else:
         # Fallback to legacy check
         legacy_service = CalendarService()
@@ -146,7 +222,7 @@ async def health_check(
     return HealthResponse(
         status="healthy",
         version=settings.app_version,
-        timestamp=datetime.utcnow().isoformat() + "Z",
+        timestamp=datetime.now(timezone.utc).isoformat(),
         services=services
     )
 
@@ -173,24 +249,15 @@ async def health_check(
     - Get user-specific information
     """
 )
-async def get_current_user(
-    session: str = Cookie(None),
+def get_current_user(
+    user=Depends(get_current_user_required),
     db: Session = Depends(get_db)
 ):
     """
     Get current authenticated user information
-    
+
     Requires valid session cookie. Returns 401 if not authenticated.
     """
-    if not session:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    user_service = UserService(db)
-    user = user_service.get_user_from_session_token(session)
-    
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid session")
-    
     # Check if user has valid Google Calendar credentials
     calendar_service = CalendarService(db=db, user_id=user.id)
     is_authenticated = calendar_service.is_authenticated(user.id)
@@ -208,7 +275,8 @@ async def get_current_user(
 
 @router.get(
     "/stats",
-    response_model=StatsResponse,
+    response_model=None,
+    responses={200: {"model": StatsResponse}},
     summary="Get Statistics",
     description="""
     Retrieve application-wide statistics.
@@ -226,36 +294,42 @@ async def get_current_user(
     - Usage tracking
     """
 )
-async def get_stats(
-    session: str = Cookie(None),
+def get_stats(
+    request: Request,
+    user_id: Optional[int] = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """
     Get application statistics
-    
+
     Returns counts of conversations and calendar events.
     If user is authenticated via session, only returns their statistics.
     Otherwise returns all statistics (for admin/backward compatibility).
+
+    The response carries a weak ETag derived from the row counts plus a
+    short max-age, so the dashboard's polling turns into 304s (and
+    browser-cache hits) while nothing has changed.
     """
     conversation_service = ConversationService(db)
-    
-    # Get user from session if available
-    user_id = None
-    if session:
-        user_service = UserService(db)
-        user = user_service.get_user_from_session_token(session)
-        if user:
-            user_id = user.id
-    
+
     stats = conversation_service.get_conversation_stats(user_id=user_id)
-    
+
+    etag = (
+        f'W/"{stats["total_conversations"]}-'
+        f'{stats["total_calendar_events"]}-{stats["total_messages"]}"'
+    )
+    headers = {"Cache-Control": "private, max-age=5", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
     logger.info(f"Stats retrieved for user_id: {user_id}")
-    return StatsResponse(**stats)
+    return ORJSONResponse(stats, headers=headers)
 
 
 @router.get(
     "/conversations",
-    response_model=List[ConversationResponse],
+    response_model=None,
+    responses={200: {"model": List[ConversationResponse]}},
     summary="List Conversations",
     description="""
     Retrieve a paginated list of all conversations.
@@ -279,7 +353,7 @@ async def get_stats(
     ```
     """
 )
-async def list_conversations(
+def list_conversations(
     limit: int = Query(
         default=50,
         le=100,
@@ -289,50 +363,59 @@ async def list_conversations(
     offset: int = Query(
         default=0,
         ge=0,
-        description="Number of results to skip for pagination"
+        description="Number of results to skip for pagination (legacy; prefer cursor)"
     ),
-    session: str = Cookie(None),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page"
+    ),
+    user_id: Optional[int] = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """
     List conversations with pagination
-    
+
     - **limit**: Maximum number of results (default 50, max 100)
-    - **offset**: Number of results to skip (for pagination)
-    
-    If user is authenticated via session, only returns their conversations.
-    Otherwise returns all conversations (for admin/backward compatibility).
+    - **cursor**: Keyset cursor for constant-cost deep paging
+    - **offset**: Number of results to skip (legacy fallback)
+
+    The X-Next-Cursor response header carries the cursor for the next
+    page. If user is authenticated via session, only returns their
+    conversations. Otherwise returns all conversations (for
+    admin/backward compatibility).
     """
     conversation_service = ConversationService(db)
-    
-    # Get user from session if available
-    user_id = None
-    if session:
-        user_service = UserService(db)
-        user = user_service.get_user_from_session_token(session)
-        if user:
-            user_id = user.id
-    
+
     conversations = conversation_service.list_conversations(
         limit=limit,
         offset=offset,
-        user_id=user_id
+        user_id=user_id,
+        before=_decode_cursor(cursor)
     )
-    
-    result = []
-    for conv in conversations:
-        result.append(ConversationResponse(
-            id=conv.id,
-            session_id=conv.session_id,
-            status=conv.status.value,
-            started_at=conv.started_at,
-            ended_at=conv.ended_at,
-            message_count=len(conv.messages),
-            events_created=len(conv.calendar_events)
-        ))
-    
+
+    # Rows come straight from the ORM, so the response is emitted
+    # without a pydantic validation round-trip (the schema above is
+    # docs-only); orjson handles the datetimes natively
+    result = [
+        {
+            "id": conv.id,
+            "session_id": conv.session_id,
+            "status": conv.status,
+            "started_at": conv.started_at,
+            "ended_at": conv.ended_at,
+            "message_count": message_count,
+            "events_created": events_created
+        }
+        for conv, message_count, events_created in conversations
+    ]
+
+    headers = {}
+    if len(conversations) == limit:
+        last = conversations[-1][0]
+        headers["X-Next-Cursor"] = _encode_cursor(last.started_at, last.id)
+
     logger.debug(f"Listed {len(result)} conversations")
-    return result
+    return ORJSONResponse(result, headers=headers)
 
 
 @router.get(
@@ -359,60 +442,36 @@ async def list_conversations(
     ```
     """
 )
-async def get_conversation(
+def get_conversation(
     conversation_id: int,
-    session: str = Cookie(None),
+    user_id: Optional[int] = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """
     Get detailed conversation by ID
-    
+
     Returns conversation with all messages and calendar events.
     If user is authenticated, only returns their own conversations.
     """
     conversation_service = ConversationService(db)
     conv = conversation_service.get_conversation_by_id(conversation_id)
-    
+
     if not conv:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    
+
     # Check if user owns this conversation
-    if session:
-        user_service = UserService(db)
-        user = user_service.get_user_from_session_token(session)
-        if user and conv.user_id and conv.user_id != user.id:
-            raise HTTPException(status_code=403, detail="Access denied to this conversation")
+    if user_id and conv.user_id and conv.user_id != user_id:
+        raise HTTPException(status_code=403, detail="Access denied to this conversation")
     
-    messages = [
-        MessageResponse(
-            id=msg.id,
-            role=msg.role,
-            content=msg.content,
-            timestamp=msg.timestamp
-        )
-        for msg in conv.messages
-    ]
-    
-    events = [
-        CalendarEventResponse(
-            id=evt.id,
-            google_event_id=evt.google_event_id,
-            summary=evt.summary,
-            start_time=evt.start_time,
-            end_time=evt.end_time,
-            attendee_name=evt.attendee_name,
-            html_link=evt.html_link,
-            created_at=evt.created_at
-        )
-        for evt in conv.calendar_events
-    ]
+    messages = _MsgListAdapter.validate_python(conv.messages, from_attributes=True)
+    events = _EvtListAdapter.validate_python(conv.calendar_events, from_attributes=True)
     
     logger.debug(f"Retrieved conversation {conversation_id}")
     
     return ConversationDetailResponse(
         id=conv.id,
         session_id=conv.session_id,
-        status=conv.status.value,
+        status=conv.status,
         started_at=conv.started_at,
         ended_at=conv.ended_at,
         message_count=len(messages),
@@ -424,7 +483,8 @@ async def get_conversation(
 
 @router.get(
     "/conversations/{conversation_id}/messages",
-    response_model=List[MessageResponse],
+    response_model=None,
+    responses={200: {"model": List[MessageResponse]}},
     summary="Get Conversation Messages",
     description="""
     Retrieve all messages for a specific conversation.
@@ -446,33 +506,58 @@ async def get_conversation(
     ```
     """
 )
-async def get_conversation_messages(
+def get_conversation_messages(
     conversation_id: int,
     db: Session = Depends(get_db)
 ):
     """
     Get messages for a specific conversation
+
+    Streams the JSON array in chunks: messages are fetched 500 rows at a
+    time and orjson-encoded as they go, so memory stays bounded no
+    matter how long the conversation is.
     """
-    conversation_service = ConversationService(db)
-    conv = conversation_service.get_conversation_by_id(conversation_id)
-    
-    if not conv:
+    exists = db.query(Conversation.id).filter(
+        Conversation.id == conversation_id
+    ).first()
+    if not exists:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    
-    return [
-        MessageResponse(
-            id=msg.id,
-            role=msg.role,
-            content=msg.content,
-            timestamp=msg.timestamp
-        )
-        for msg in conv.messages
-    ]
+
+    stmt = (
+        select(Message)
+        .options(load_only(Message.id, Message.role, Message.content, Message.timestamp))
+        .where(Message.conversation_id == conversation_id)
+        .order_by(Message.timestamp)
+        .execution_options(yield_per=500)
+    )
+
+    def generate():
+        # A dedicated session: the request-scoped one may be torn down
+        # before the response body finishes streaming
+        stream_db = SessionLocal()
+        try:
+            yield b"["
+            first = True
+            for msg in stream_db.execute(stmt).scalars():
+                chunk = orjson.dumps({
+                    "id": msg.id,
+                    "role": msg.role,
+                    "content": msg.content,
+                    "timestamp": msg.timestamp
+                })
+                yield chunk if first else b"," + chunk
+                first = False
+            yield b"]"
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 @router.get(
     "/events",
-    response_model=List[CalendarEventResponse],
+    response_model=None,
+    responses={200: {"model": List[CalendarEventResponse]}},
     summary="List Calendar Events",
     description="""
     Retrieve a paginated list of all calendar events created through the application.
@@ -495,7 +580,7 @@ async def get_conversation_messages(
     ```
     """
 )
-async def list_calendar_events(
+def list_calendar_events(
     limit: int = Query(
         default=50,
         le=100,
@@ -505,44 +590,49 @@ async def list_calendar_events(
     offset: int = Query(
         default=0,
         ge=0,
-        description="Number of results to skip for pagination"
+        description="Number of results to skip for pagination (legacy; prefer cursor)"
     ),
-    session: str = Cookie(None),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor from the X-Next-Cursor header of the previous page"
+    ),
+    user_id: Optional[int] = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """
     List calendar events created through the application.
-    
-    If user is authenticated via session, only returns events from their conversations.
-    Otherwise returns all events (for admin/backward compatibility).
+
+    The X-Next-Cursor response header carries the cursor for the next
+    page. If user is authenticated via session, only returns events from
+    their conversations. Otherwise returns all events (for
+    admin/backward compatibility).
     """
     conversation_service = ConversationService(db)
-    
-    # Get user from session if available
-    user_id = None
-    if session:
-        user_service = UserService(db)
-        user = user_service.get_user_from_session_token(session)
-        if user:
-            user_id = user.id
-    
+
     # List events, filtered by user if authenticated
     events = conversation_service.list_calendar_events(
         limit=limit,
         offset=offset,
-        user_id=user_id
+        user_id=user_id,
+        before=_decode_cursor(cursor)
     )
-    
-    return [
-        CalendarEventResponse(
-            id=evt.id,
-            google_event_id=evt.google_event_id,
-            summary=evt.summary,
-            start_time=evt.start_time,
-            end_time=evt.end_time,
-            attendee_name=evt.attendee_name,
-            html_link=evt.html_link,
-            created_at=evt.created_at
-        )
+
+    headers = {}
+    if len(events) == limit:
+        last = events[-1]
+        headers["X-Next-Cursor"] = _encode_cursor(last.created_at, last.id)
+
+    # Trusted ORM rows; serialized directly without re-validation
+    return ORJSONResponse([
+        {
+            "id": evt.id,
+            "google_event_id": evt.google_event_id,
+            "summary": evt.summary,
+            "start_time": evt.start_time,
+            "end_time": evt.end_time,
+            "attendee_name": evt.attendee_name,
+            "html_link": evt.html_link,
+            "created_at": evt.created_at
+        }
         for evt in events
-    ]
+    ], headers=headers)
@@ -2,19 +2,36 @@
 Google OAuth authentication routes with multi-user support
 """
 
+import hashlib
+
 from fastapi import APIRouter, Request, Response, Cookie, Depends
 from fastapi.responses import RedirectResponse, JSONResponse
+from google.auth.exceptions import GoogleAuthError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.services.calendar import CalendarService
 from app.services.user import UserService
+from app.utils.session import cache_session_user_id, session_store
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Session cookie attributes shared by login and callback; only the value
+# differs per response. Keeping them in one place also keeps the secure
+# flag consistent between the two paths.
+_SESSION_COOKIE_KW = dict(
+    key="session",
+    max_age=30 * 24 * 60 * 60,  # 30 days
+    httponly=True,
+    samesite="lax",
+    secure=False,  # Set to True in production with HTTPS
+    path="/"  # Ensure cookie is available for all paths
+)
+
 
 def get_session_token(request: Request, session: str = Cookie(None)) -> str:
     """Get session token from cookie or create new one"""
@@ -37,33 +54,43 @@ def get_session_token(request: Request, session: str = Cookie(None)) -> str:
     """
 )
 async def auth_status(
+    request: Request,
     session: str = Cookie(None),
     db: Session = Depends(get_db)
 ):
-    """Check if Google Calendar is authenticated for current user"""
-    logger.info(f"Auth status check - session cookie: {session[:8] if session else 'None'}")
+    """Check if Google Calendar is authenticated for current user
+
+    The response carries an ETag over (user_id, authenticated); the
+    front-end polls this endpoint every few seconds, and while nothing
+    changes each poll collapses to an empty 304.
+    """
+    logger.debug("Auth status check - session cookie: %s", session[:8] if session else "None")
     
     user_service = UserService(db)
-    user = user_service.get_user_from_session_token(session)
-    
-    if user:
-        logger.info(f"User found from session: {user.email}, user_id: {user.id}")
-        calendar_service = CalendarService(db=db, user_id=user.id)
-        is_authenticated = calendar_service.is_authenticated(user.id)
-        
-        logger.info(f"Calendar authenticated: {is_authenticated}")
-        return JSONResponse({
+    identity = user_service.get_session_identity(session)
+
+    if identity:
+        calendar_service = CalendarService(db=db, user_id=identity.user_id)
+        is_authenticated = calendar_service.is_authenticated(identity.user_id)
+        payload = {
             "authenticated": is_authenticated,
-            "email": user.email if is_authenticated else None,
-            "message": f"Connected as {user.email}" if is_authenticated else "Not connected"
-        })
+            "email": identity.email if is_authenticated else None,
+            "message": f"Connected as {identity.email}" if is_authenticated else "Not connected"
+        }
+        etag_key = f"{identity.user_id}:{is_authenticated}"
     else:
-        logger.info("No user found from session cookie")
-        return JSONResponse({
+        payload = {
             "authenticated": False,
             "email": None,
             "message": "Not connected"
-        })
+        }
+        etag_key = "anonymous:False"
+
+    etag = f'"{hashlib.blake2b(etag_key.encode(), digest_size=8).hexdigest()}"'
+    headers = {"Cache-Control": "private, no-cache", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, headers=headers)
 
 
 @router.get(
@@ -103,13 +130,13 @@ async def auth_login(
         session = session_token
     else:
         # Verify existing session is valid
-        user = user_service.get_user_from_session_token(session)
-        if not user:
+        identity = user_service.get_session_identity(session)
+        if not identity:
             # Session invalid, create new one
             session_token = user_service.create_user_session(user_id=None)
             session = session_token
     
-    logger.info(f"OAuth login initiated", extra={"client_ip": client_ip, "session": session[:8]})
+    logger.info("OAuth login initiated", extra={"client_ip": client_ip, "session": session[:8]})
     
     # Create calendar service and get auth URL with state
     calendar_service = CalendarService(db=db)
@@ -117,17 +144,8 @@ async def auth_login(
     
     # Create redirect response and set cookie
     redirect = RedirectResponse(url=auth_url)
-    redirect.set_cookie(
-        key="session",
-        value=session,
-        max_age=30 * 24 * 60 * 60,  # 30 days
-        httponly=True,
-        samesite="lax",
-        secure=False,  # Set to True in production with HTTPS
-        path="/"  # Ensure cookie is available for all paths
-    )
+    redirect.set_cookie(value=session, **_SESSION_COOKIE_KW)
     
-    logger.info(f"Session cookie set for OAuth flow: {session[:8]}")
     return redirect
 
 
@@ -145,7 +163,7 @@ async def auth_callback(
     oauth_state = request.query_params.get("state") or state
     
     if error:
-        logger.warning(f"OAuth error: {error}")
+        logger.warning("OAuth error: %s", error)
         return RedirectResponse(url=f"/?auth=error&message={error}")
     
     if not code:
@@ -180,7 +198,7 @@ async def auth_callback(
             # This ensures the session can be linked even if email retrieval fails
             from datetime import datetime
             user_email = f"user_{session_token[:8]}_{datetime.utcnow().strftime('%Y%m%d')}@oauth.local"
-            logger.warning(f"OAuth successful but no email retrieved, using placeholder: {user_email}")
+            logger.warning("OAuth successful but no email retrieved, using placeholder: %s", user_email)
         
         user = user_service.get_or_create_user(user_email)
         
@@ -193,28 +211,26 @@ async def auth_callback(
         if db_session:
             db_session.user_id = user.id
             db.commit()
+            # Overwrite any cached anonymous resolution of this token
+            cache_session_user_id(session_token, user.id, user.email)
+            if session_store:
+                try:
+                    session_store.put(session_token, user.id, user.email)
+                except Exception as e:
+                    logger.warning(f"Redis session write failed: {e}")
         else:
             # Create new session if none exists
             session_token = user_service.create_user_session(user_id=user.id)
         
         # Set session cookie in response
-        logger.info(f"Setting session cookie in callback: {session_token[:8]}, user_id: {user.id}")
         redirect = RedirectResponse(url="/?auth=success")
-        redirect.set_cookie(
-            key="session",
-            value=session_token,
-            max_age=30 * 24 * 60 * 60,  # 30 days
-            httponly=True,
-            samesite="lax",
-            secure=False,  # Set to True in production with HTTPS
-            path="/"  # Ensure cookie is available for all paths
-        )
+        redirect.set_cookie(value=session_token, **_SESSION_COOKIE_KW)
         
-        logger.info(f"OAuth authentication successful for user: {user_email}")
+        logger.info("OAuth authentication successful for user: %s", user_email)
         return redirect
     
-    except Exception as e:
-        logger.error(f"OAuth callback error: {e}")
+    except (GoogleAuthError, SQLAlchemyError) as e:
+        logger.error("OAuth callback error: %s", e)
         return RedirectResponse(url=f"/?auth=error&message={str(e)}")
 
 
@@ -236,14 +252,14 @@ async def auth_logout(
     """Remove Google Calendar authentication and session"""
     if session:
         user_service = UserService(db)
-        user = user_service.get_user_from_session_token(session)
-        
-        if user:
+        identity = user_service.get_session_identity(session)
+
+        if identity:
             # Revoke user's credentials
-            calendar_service = CalendarService(db=db, user_id=user.id)
-            calendar_service.revoke_credentials(user.id)
-        
-        # Delete session
+            calendar_service = CalendarService(db=db, user_id=identity.user_id)
+            calendar_service.revoke_credentials(identity.user_id)
+
+        # Delete session (also drops it from the TTL cache)
         user_service.delete_user_session(session)
         logger.info("User logged out and session deleted")
     else:
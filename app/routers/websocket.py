@@ -3,11 +3,14 @@ WebSocket router for real-time voice communication with multi-user support
 """
 
 import asyncio
-import json
+import base64
+import ssl
+import time
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
 from sqlalchemy.orm import Session
+import orjson
 import websockets
 
 from app.config import settings
@@ -27,25 +30,113 @@ logger = get_logger(__name__)
 
 router = APIRouter(tags=["WebSocket"])
 
+# Byte template for input_audio_buffer.append: browser binary audio is
+# base64-encoded and spliced between these halves, skipping a dict
+# build + JSON encode per chunk (base64 output never needs escaping)
+_APPEND_PREFIX = b'{"type":"input_audio_buffer.append","audio":"'
+_APPEND_SUFFIX = b'"}'
+
+# orjson decodes/encodes the small relay frames several times faster
+# than the stdlib; bound methods skip a module attribute lookup per call
+_loads = orjson.loads
+_dumps = orjson.dumps
+
+# Upstream headers are a pure function of settings; build them once
+_WS_HEADERS = get_websocket_headers()
+
+# One TLS context shared by every upstream dial. Its client-side
+# session cache enables TLS session resumption, so reconnects skip the
+# full handshake; a fresh context per connect (the websockets default)
+# starts cold every time.
+_OPENAI_SSL_CTX = ssl.create_default_context()
+
+# Constant control frames, serialized once instead of per send
+_COMMIT_JSON = _dumps({"type": "input_audio_buffer.commit"}).decode()
+_RESPONSE_CREATE_JSON = _dumps({"type": "response.create"}).decode()
+_RESPONSE_CREATE_AUDIO_JSON = _dumps({
+    "type": "response.create",
+    "response": {"modalities": ["text", "audio"]}
+}).decode()
+
+# get_session_config() embeds the current date/time for the system
+# prompt, so it cannot be frozen at import; caching the serialized
+# payload per minute still collapses every connect within that minute
+# to a string reuse
+_session_config_key = None
+_session_config_json = ""
+
+# How long transcript rows may sit in the per-connection buffer before
+# they are flushed to the database in one INSERT
+_MSG_FLUSH_INTERVAL = 2.0
+
+
+# The dominant inbound frame type; routed on a cheap substring probe so
+# the fast path below skips the full JSON parse
+_AUDIO_DELTA_MARKER = '"type":"response.audio.delta"'
+
+
+def _extract_audio_delta(message: str):
+    """Pull the base64 delta from a response.audio.delta frame by string
+    slicing. Returns None when the frame doesn't match the expected
+    shape, in which case the caller falls back to a normal parse."""
+    start = message.find('"delta":"')
+    if start == -1:
+        return None
+    start += 9  # len('"delta":"')
+    end = message.find('"', start)
+    if end == -1:
+        return None
+    delta = message[start:end]
+    # base64 contains no escapes; a backslash means the probe misfired
+    if '\\' in delta:
+        return None
+    return delta
+
+
+# Legacy base64-in-JSON mic frames, routed on the same substring-probe
+# trick as the downstream audio deltas
+_CLIENT_AUDIO_MARKER = '"type":"audio"'
+
+
+def _extract_client_audio(message: str):
+    """Pull the base64 payload from a {"type":"audio",...} mic frame by
+    string slicing; None if the frame doesn't match the expected shape."""
+    start = message.find('"audio":"')
+    if start == -1:
+        return None
+    start += 9  # len('"audio":"')
+    end = message.find('"', start)
+    if end == -1:
+        return None
+    audio = message[start:end]
+    if '\\' in audio:
+        return None
+    return audio
+
+
+def _parse_iso(value) -> datetime:
+    """Parse an ISO timestamp (tolerating a trailing 'Z'), None if empty"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+def _session_config_json_cached() -> str:
+    """Serialized session config, re-rendered at most once a minute"""
+    global _session_config_key, _session_config_json
+    key = int(time.time()) // 60
+    if key != _session_config_key:
+        _session_config_json = _dumps(get_session_config()).decode()
+        _session_config_key = key
+    return _session_config_json
+
 
 def get_session_from_websocket(client_ws: WebSocket) -> str:
-    """Extract session token from WebSocket cookies or query params"""
-    # Try cookies first
-    cookie_header = client_ws.headers.get("cookie", "")
-    if cookie_header:
-        for cookie in cookie_header.split(";"):
-            cookie = cookie.strip()
-            if cookie.startswith("session="):
-                return cookie.split("=", 1)[1]
-    
-    # Try query parameter as fallback
-    query_string = client_ws.url.query
-    if query_string:
-        params = dict(param.split("=") for param in query_string.split("&") if "=" in param)
-        if "session" in params:
-            return params["session"]
-    
-    return None
+    """Extract session token from WebSocket cookies or query params.
+
+    Starlette parses both lazily with its own (C-backed) parsers, which
+    also handles URL-encoded values and quoted cookies that the old
+    hand-rolled split-on-";"/"&" mangled.
+    """
+    return client_ws.cookies.get("session") or client_ws.query_params.get("session")
 
 
 @router.websocket("/ws")
@@ -95,10 +186,10 @@ async def websocket_endpoint(
     # Extract session token
     session_token = get_session_from_websocket(client_ws)
     
-    # Get user from session
+    # Get user from session (cached (user_id, email); no ORM load)
     user_service = UserService(db)
-    user = user_service.get_user_from_session_token(session_token) if session_token else None
-    user_id = user.id if user else None
+    identity = user_service.get_session_identity(session_token)
+    user_id = identity.user_id if identity else None
     
     # Create conversation session linked to user
     conversation_service = ConversationService(db)
@@ -120,12 +211,42 @@ async def websocket_endpoint(
         user_id=user_id
     )
     
-    ctx_logger.info("WebSocket connection established", extra={"user_email": user.email if user else None})
+    ctx_logger.info("WebSocket connection established", extra={"user_email": identity.email if identity else None})
+
+    # Transcript rows are buffered here and written in one INSERT every
+    # _MSG_FLUSH_INTERVAL seconds (and at teardown) instead of paying a
+    # commit per transcript
+    pending_msgs: list[tuple[str, str, datetime]] = []
+
+    def queue_message(role: str, content: str) -> None:
+        pending_msgs.append((role, content, datetime.utcnow()))
+
+    def flush_messages() -> None:
+        if pending_msgs:
+            rows = pending_msgs[:]
+            pending_msgs.clear()
+            try:
+                conversation_service.add_messages_bulk(session_id, rows)
+            except Exception as e:
+                ctx_logger.error("Message flush failed: %s", e)
+
+    async def flush_messages_loop() -> None:
+        while True:
+            await asyncio.sleep(_MSG_FLUSH_INTERVAL)
+            flush_messages()
+
+    async def send_browser(payload: dict) -> None:
+        """Send a JSON payload to the browser as a text frame.
+
+        orjson emits bytes; decode to text because the client reserves
+        binary frames for raw audio.
+        """
+        await client_ws.send_text(_dumps(payload).decode())
     
     # Validate API key
     if not settings.openai_api_key:
         ctx_logger.error("OpenAI API key not configured")
-        await client_ws.send_json({
+        await send_browser({
             "type": "error",
             "message": "OpenAI API key not configured"
         })
@@ -135,26 +256,29 @@ async def websocket_endpoint(
     
     # Check Google Calendar auth for this user
     is_authenticated = user_calendar_service.is_authenticated(user_id) if user_id else False
-    await client_ws.send_json({
+    await send_browser({
         "type": "auth_status",
         "authenticated": is_authenticated,
-        "email": user.email if user and is_authenticated else None
+        "email": identity.email if identity and is_authenticated else None
     })
     
     try:
         async with websockets.connect(
             settings.openai_realtime_url,
-            additional_headers=get_websocket_headers(),
+            additional_headers=_WS_HEADERS,
+            ssl=_OPENAI_SSL_CTX,
             ping_interval=20,
             ping_timeout=20
         ) as openai_ws:
             
             ctx_logger.info("Connected to OpenAI Realtime API")
             
-            # Send initial status
-            await client_ws.send_json({
+            # Send initial status; "binary" tells the client it may send
+            # raw PCM frames instead of base64-in-JSON
+            await send_browser({
                 "type": "status",
                 "status": "connected",
+                "binary": True,
                 "message": "Connected to OpenAI Realtime API"
             })
             
@@ -162,223 +286,281 @@ async def websocket_endpoint(
                 """Relay messages from browser to OpenAI"""
                 try:
                     while True:
-                        data = await client_ws.receive_text()
-                        msg = json.loads(data)
+                        frame = await client_ws.receive()
+                        if frame.get("type") == "websocket.disconnect":
+                            ctx_logger.info("Browser WebSocket disconnected")
+                            break
+                        
+                        raw = frame.get("bytes")
+                        if raw is not None:
+                            # Raw PCM16 frame from the browser: base64 only
+                            # at the OpenAI boundary, no JSON in between
+                            await openai_ws.send(
+                                (_APPEND_PREFIX + base64.b64encode(raw)
+                                 + _APPEND_SUFFIX).decode()
+                            )
+                            continue
+                        
+                        text = frame.get("text", "{}")
+                        
+                        # Legacy JSON audio fallback: splice the already-
+                        # base64 payload into the append template without
+                        # a parse/re-serialize round trip
+                        if text.find(_CLIENT_AUDIO_MARKER, 0, 40) != -1:
+                            audio = _extract_client_audio(text)
+                            if audio is not None:
+                                await openai_ws.send(
+                                    (_APPEND_PREFIX + audio.encode()
+                                     + _APPEND_SUFFIX).decode()
+                                )
+                                continue
+                        
+                        msg = _loads(text)
                         
                         if msg.get("type") == "audio":
                             # Relay audio to OpenAI
-                            await openai_ws.send(json.dumps({
+                            await openai_ws.send(_dumps({
                                 "type": "input_audio_buffer.append",
                                 "audio": msg.get("audio", "")
-                            }))
+                            }).decode())
                         elif msg.get("type") == "start":
                             # Send session config and start response
                             ctx_logger.info("Session started by user")
-                            await openai_ws.send(json.dumps(get_session_config()))
+                            await openai_ws.send(_session_config_json_cached())
                         elif msg.get("type") == "stop":
                             # Commit current audio buffer
-                            await openai_ws.send(json.dumps({
-                                "type": "input_audio_buffer.commit"
-                            }))
+                            await openai_ws.send(_COMMIT_JSON)
                 except WebSocketDisconnect:
                     ctx_logger.info("Browser WebSocket disconnected")
-                except Exception as e:
-                    ctx_logger.error(f"Browser->OpenAI relay error: {e}")
+                except websockets.exceptions.ConnectionClosed as e:
+                    ctx_logger.info("OpenAI WebSocket closed: %s", e)
             
             async def relay_to_browser():
-                """Relay messages from OpenAI to browser"""
-                try:
-                    async for message in openai_ws:
-                        event = json.loads(message)
-                        event_type = event.get("type", "")
-                        
-                        # Session events
-                        if event_type == "session.created":
-                            ctx_logger.debug("OpenAI session created")
-                            await client_ws.send_json({
-                                "type": "status",
-                                "status": "ready",
-                                "message": "Session ready"
-                            })
-                        
-                        elif event_type == "session.updated":
-                            ctx_logger.debug("OpenAI session updated, triggering initial response")
-                            # Trigger initial response
-                            await openai_ws.send(json.dumps({
-                                "type": "response.create",
-                                "response": {"modalities": ["text", "audio"]}
-                            }))
-                        
-                        # Response events
-                        elif event_type == "response.created":
-                            await client_ws.send_json({
-                                "type": "status",
-                                "status": "speaking",
-                                "message": "Assistant speaking"
-                            })
-                        
-                        elif event_type == "response.done":
-                            response = event.get("response", {})
-                            output = response.get("output", [])
+                """Relay messages from OpenAI to browser.
+
+                Each event type maps to a handler closure through a dict:
+                one C-level hash lookup per event instead of walking a
+                chain of string comparisons for every frame.
+                """
+                
+                async def on_session_created(event):
+                    ctx_logger.debug("OpenAI session created")
+                    await send_browser({
+                        "type": "status",
+                        "status": "ready",
+                        "message": "Session ready"
+                    })
+                
+                async def on_session_updated(event):
+                    ctx_logger.debug("OpenAI session updated, triggering initial response")
+                    # Trigger initial response
+                    await openai_ws.send(_RESPONSE_CREATE_AUDIO_JSON)
+                
+                async def on_response_created(event):
+                    await send_browser({
+                        "type": "status",
+                        "status": "speaking",
+                        "message": "Assistant speaking"
+                    })
+                
+                async def on_response_done(event):
+                    response = event.get("response", {})
+                    output = response.get("output", [])
+                    
+                    # Check for function calls
+                    for item in output:
+                        if item.get("type") == "function_call":
+                            await handle_function_call_item(item)
+                    
+                    await send_browser({
+                        "type": "status",
+                        "status": "listening",
+                        "message": "Listening"
+                    })
+                
+                async def handle_function_call_item(item):
+                    call_id = item.get("call_id")
+                    name = item.get("name")
+                    # Decode the arguments once; the handler and the
+                    # event-recording branch below share the dict
+                    try:
+                        args = _loads(item.get("arguments", "{}"))
+                    except orjson.JSONDecodeError:
+                        ctx_logger.error("Malformed function arguments")
+                        args = {}
+                    
+                    # Execute function with user-specific calendar service
+                    result = await handle_function_call(
+                        call_id, name, args,
+                        user_calendar_service,
+                        session_id
+                    )
+                    
+                    # Record calendar event in database
+                    if name == "add_calendar_event" and result.get("success"):
+                        try:
+                            # One parse per timestamp, args first
+                            # with the API result as fallback
+                            start_dt = _parse_iso(
+                                args.get("start_time") or result.get("start")
+                            )
+                            if start_dt is None:
+                                ctx_logger.error("No start_time found in event result")
                             
-                            # Check for function calls
-                            for item in output:
-                                if item.get("type") == "function_call":
-                                    call_id = item.get("call_id")
-                                    name = item.get("name")
-                                    arguments = item.get("arguments", "{}")
-                                    
-                                    # Execute function with user-specific calendar service
-                                    result = await handle_function_call(
-                                        call_id, name, arguments,
-                                        user_calendar_service,
-                                        session_id
-                                    )
-                                    
-                                    # Record calendar event in database
-                                    if name == "add_calendar_event" and result.get("success"):
-                                        args = json.loads(arguments)
-                                        try:
-                                            # Parse start time - handle timezone-aware and naive datetimes
-                                            start_time_str = args.get("start_time", "")
-                                            if start_time_str:
-                                                start_time_str = start_time_str.replace('Z', '+00:00')
-                                                start_dt = datetime.fromisoformat(start_time_str)
-                                            else:
-                                                # Fallback to result data
-                                                start_time_str = result.get("start", "")
-                                                if start_time_str:
-                                                    start_time_str = start_time_str.replace('Z', '+00:00')
-                                                    start_dt = datetime.fromisoformat(start_time_str)
-                                                else:
-                                                    ctx_logger.error("No start_time found in event result")
-                                                    start_dt = None
-                                            
-                                            # Parse end time
-                                            end_str = args.get("end_time") or result.get("end")
-                                            if end_str:
-                                                end_str = end_str.replace('Z', '+00:00')
-                                                end_dt = datetime.fromisoformat(end_str)
-                                            elif start_dt:
-                                                end_dt = start_dt + timedelta(hours=1)
-                                            else:
-                                                end_dt = None
-                                            
-                                            if start_dt and end_dt:
-                                                # Convert to UTC for database storage if timezone-aware
-                                                if start_dt.tzinfo:
-                                                    start_dt = start_dt.astimezone(timezone.utc).replace(tzinfo=None)
-                                                if end_dt.tzinfo:
-                                                    end_dt = end_dt.astimezone(timezone.utc).replace(tzinfo=None)
-                                                
-                                                conversation_service.add_calendar_event(
-                                                    session_id=session_id,
-                                                    google_event_id=result.get("event_id"),
-                                                    summary=result.get("summary") or args.get("summary", "Meeting"),
-                                                    start_time=start_dt,
-                                                    end_time=end_dt,
-                                                    description=args.get("description"),
-                                                    attendee_name=args.get("attendee_name"),
-                                                    html_link=result.get("html_link")
-                                                )
-                                                ctx_logger.info(f"Calendar event recorded: {result.get('event_id')}")
-                                            else:
-                                                ctx_logger.error("Could not parse start_time or end_time for calendar event")
-                                        except Exception as e:
-                                            ctx_logger.error(f"Error recording calendar event: {e}", exc_info=True)
-                                    
-                                    # Send result to browser
-                                    await client_ws.send_json({
-                                        "type": "function_result",
-                                        "name": name,
-                                        "result": result
-                                    })
-                                    
-                                    # Send result back to OpenAI
-                                    await openai_ws.send(json.dumps({
-                                        "type": "conversation.item.create",
-                                        "item": {
-                                            "type": "function_call_output",
-                                            "call_id": call_id,
-                                            "output": json.dumps(result)
-                                        }
-                                    }))
-                                    
-                                    # Request acknowledgment response
-                                    await openai_ws.send(json.dumps({
-                                        "type": "response.create"
-                                    }))
+                            end_dt = _parse_iso(
+                                args.get("end_time") or result.get("end")
+                            )
+                            if end_dt is None and start_dt:
+                                end_dt = start_dt + timedelta(hours=1)
                             
-                            await client_ws.send_json({
-                                "type": "status",
-                                "status": "listening",
-                                "message": "Listening"
-                            })
-                        
-                        # Audio events
-                        elif event_type == "response.audio.delta":
-                            delta = event.get("delta", "")
-                            if delta:
-                                await client_ws.send_json({
-                                    "type": "audio",
-                                    "audio": delta
-                                })
-                        
-                        # Transcript events
-                        elif event_type == "response.audio_transcript.delta":
-                            transcript = event.get("delta", "")
-                            if transcript:
-                                await client_ws.send_json({
-                                    "type": "transcript",
-                                    "role": "assistant",
-                                    "delta": transcript
-                                })
-                        
-                        elif event_type == "response.audio_transcript.done":
-                            transcript = event.get("transcript", "")
-                            await client_ws.send_json({
-                                "type": "transcript_done",
-                                "role": "assistant",
-                                "text": transcript
-                            })
-                            # Store assistant message
-                            if transcript:
-                                conversation_service.add_message(
-                                    session_id, "assistant", transcript
-                                )
-                        
-                        elif event_type == "conversation.item.input_audio_transcription.completed":
-                            transcript = event.get("transcript", "")
-                            if transcript:
-                                await client_ws.send_json({
-                                    "type": "transcript_done",
-                                    "role": "user",
-                                    "text": transcript
-                                })
-                                # Store user message
-                                conversation_service.add_message(
-                                    session_id, "user", transcript
+                            if start_dt and end_dt:
+                                # Convert to UTC for database storage if timezone-aware
+                                if start_dt.tzinfo:
+                                    start_dt = start_dt.astimezone(timezone.utc).replace(tzinfo=None)
+                                if end_dt.tzinfo:
+                                    end_dt = end_dt.astimezone(timezone.utc).replace(tzinfo=None)
+                                
+                                conversation_service.add_calendar_event(
+                                    session_id=session_id,
+                                    google_event_id=result.get("event_id"),
+                                    summary=result.get("summary") or args.get("summary", "Meeting"),
+                                    start_time=start_dt,
+                                    end_time=end_dt,
+                                    description=args.get("description"),
+                                    attendee_name=args.get("attendee_name"),
+                                    html_link=result.get("html_link")
                                 )
+                                ctx_logger.info("Calendar event recorded: %s", result.get("event_id"))
+                            else:
+                                ctx_logger.error("Could not parse start_time or end_time for calendar event")
+                        except Exception as e:
+                            ctx_logger.error("Error recording calendar event: %s", e, exc_info=True)
+                    
+                    # Send result to browser
+                    await send_browser({
+                        "type": "function_result",
+                        "name": name,
+                        "result": result
+                    })
+                    
+                    # Send result back to OpenAI
+                    await openai_ws.send(_dumps({
+                        "type": "conversation.item.create",
+                        "item": {
+                            "type": "function_call_output",
+                            "call_id": call_id,
+                            "output": _dumps(result).decode()
+                        }
+                    }).decode())
+                    
+                    # Request acknowledgment response
+                    await openai_ws.send(_RESPONSE_CREATE_JSON)
+                
+                # Audio events. Decoded PCM goes out as a binary frame:
+                # ~25% fewer bytes than re-wrapping the base64 in JSON,
+                # and the browser skips both the JSON parse and its own
+                # base64 decode
+                async def on_audio_delta(event):
+                    delta = event.get("delta", "")
+                    if delta:
+                        await client_ws.send_bytes(base64.b64decode(delta))
+                
+                async def on_transcript_delta(event):
+                    transcript = event.get("delta", "")
+                    if transcript:
+                        await send_browser({
+                            "type": "transcript",
+                            "role": "assistant",
+                            "delta": transcript
+                        })
+                
+                async def on_transcript_done(event):
+                    transcript = event.get("transcript", "")
+                    await send_browser({
+                        "type": "transcript_done",
+                        "role": "assistant",
+                        "text": transcript
+                    })
+                    # Store assistant message (buffered)
+                    if transcript:
+                        queue_message("assistant", transcript)
+                
+                async def on_input_transcription_done(event):
+                    transcript = event.get("transcript", "")
+                    if transcript:
+                        await send_browser({
+                            "type": "transcript_done",
+                            "role": "user",
+                            "text": transcript
+                        })
+                        # Store user message (buffered)
+                        queue_message("user", transcript)
+                
+                async def on_error(event):
+                    error = event.get("error", {})
+                    error_msg = error.get("message", "Unknown error")
+                    ctx_logger.error("OpenAI error: %s", error_msg)
+                    await send_browser({
+                        "type": "error",
+                        "message": error_msg
+                    })
+                
+                handlers = {
+                    "session.created": on_session_created,
+                    "session.updated": on_session_updated,
+                    "response.created": on_response_created,
+                    "response.done": on_response_done,
+                    "response.audio.delta": on_audio_delta,
+                    "response.audio_transcript.delta": on_transcript_delta,
+                    "response.audio_transcript.done": on_transcript_done,
+                    "conversation.item.input_audio_transcription.completed":
+                        on_input_transcription_done,
+                    "error": on_error,
+                }
+                
+                try:
+                    async for message in openai_ws:
+                        # Fast path: audio deltas are ~50/sec per user,
+                        # so the payload is sliced out without decoding
+                        # the whole frame
+                        if isinstance(message, str) and message.find(_AUDIO_DELTA_MARKER, 0, 80) != -1:
+                            delta = _extract_audio_delta(message)
+                            if delta is not None:
+                                await client_ws.send_bytes(base64.b64decode(delta))
+                                continue
                         
-                        # Error handling
-                        elif event_type == "error":
-                            error = event.get("error", {})
-                            error_msg = error.get("message", "Unknown error")
-                            ctx_logger.error(f"OpenAI error: {error_msg}")
-                            await client_ws.send_json({
-                                "type": "error",
-                                "message": error_msg
-                            })
+                        event = _loads(message)
+                        handler = handlers.get(event.get("type", ""))
+                        if handler:
+                            await handler(event)
                 
                 except websockets.exceptions.ConnectionClosed as e:
-                    ctx_logger.info(f"OpenAI WebSocket closed: {e}")
-                except Exception as e:
-                    ctx_logger.error(f"OpenAI->Browser relay error: {e}")
+                    ctx_logger.info("OpenAI WebSocket closed: %s", e)
+                except WebSocketDisconnect:
+                    ctx_logger.info("Browser WebSocket disconnected")
             
-            # Run both relay tasks concurrently
+            # Run both relay directions until either leg finishes, then
+            # cancel the survivor: gather() would keep the other relay
+            # (and the upstream socket) alive until the second side also
+            # closed on its own
+            flush_task = asyncio.create_task(flush_messages_loop())
+            relay_up = asyncio.create_task(relay_to_openai())
+            relay_down = asyncio.create_task(relay_to_browser())
+            done, pending = await asyncio.wait(
+                {relay_up, relay_down},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            # Ordinary disconnects return normally above; anything else
+            # is a genuine failure and is logged with its traceback
+            for task in done:
+                exc = task.exception()
+                if exc is not None:
+                    ctx_logger.error("Relay task failed: %s", exc, exc_info=exc)
+            for task in pending:
+                task.cancel()
+            flush_task.cancel()
             await asyncio.gather(
-                relay_to_openai(),
-                relay_to_browser()
+                *pending, flush_task, return_exceptions=True
             )
     
     except websockets.exceptions.InvalidStatusCode as e:
@@ -387,21 +569,22 @@ async def websocket_endpoint(
             error_msg = "Invalid OpenAI API key"
         elif "429" in str(e):
             error_msg = "Rate limited - please wait"
-        ctx_logger.error(f"OpenAI connection failed: {error_msg}")
-        await client_ws.send_json({
+        ctx_logger.error("OpenAI connection failed: %s", error_msg)
+        await send_browser({
             "type": "error",
             "message": error_msg
         })
         conversation_service.end_conversation(session_id, ConversationStatus.ERROR)
     except Exception as e:
-        ctx_logger.error(f"WebSocket error: {e}")
-        await client_ws.send_json({
+        ctx_logger.error("WebSocket error: %s", e)
+        await send_browser({
             "type": "error",
             "message": str(e)
         })
         conversation_service.end_conversation(session_id, ConversationStatus.ERROR)
     finally:
-        # End conversation
+        # Persist any buffered transcripts, then end the conversation
+        flush_messages()
         conversation_service.end_conversation(session_id, ConversationStatus.COMPLETED)
         ctx_logger.info("WebSocket session ended")
         try:
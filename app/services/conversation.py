@@ -2,16 +2,26 @@
 Conversation service for storing and retrieving conversation history
 """
 
-import uuid
+import logging
+import secrets
+import time
 from datetime import datetime
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from typing import Optional, List, Tuple
+from sqlalchemy import func, insert, literal, select, tuple_
+from sqlalchemy.orm import Session, load_only, selectinload
 
 from app.models import Conversation, Message, CalendarEvent, ConversationStatus
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# TTL cache for dashboard stats. COUNT(*) is O(N) in SQLite, and the
+# stats endpoint is polled; 60 seconds of staleness is invisible on a
+# dashboard but caps the table scans at one per key per minute.
+# Values map user_id (None = all users) -> (monotonic deadline, stats).
+_STATS_CACHE_TTL = 60.0
+_stats_cache: dict = {}
+
 
 class ConversationService:
     """Service for managing conversation history"""
@@ -26,7 +36,9 @@ class ConversationService:
         user_id: Optional[int] = None
     ) -> Conversation:
         """Create a new conversation session"""
-        session_id = str(uuid.uuid4())
+        # 32 hex chars: shorter than a hyphenated UUID, cheaper to
+        # generate, and still 128 bits of randomness
+        session_id = secrets.token_hex(16)
         
         conversation = Conversation(
             session_id=session_id,
@@ -49,13 +61,29 @@ class ConversationService:
     
     def get_conversation(self, session_id: str) -> Optional[Conversation]:
         """Get conversation by session ID"""
-        return self.db.query(Conversation).filter(
-            Conversation.session_id == session_id
+        # 2.0-style select: the compiled SQL is reused from the
+        # engine's statement cache on repeat calls
+        return self.db.scalars(
+            select(Conversation)
+            .where(Conversation.session_id == session_id)
+            .limit(1)
         ).first()
     
     def get_conversation_by_id(self, conversation_id: int) -> Optional[Conversation]:
-        """Get conversation by ID"""
-        return self.db.query(Conversation).filter(
+        """Get conversation by ID, with messages and events loaded"""
+        # load_only trims columns the detail response never serializes
+        # (user_agent, event descriptions, ...) from the eager loads
+        return self.db.query(Conversation).options(
+            selectinload(Conversation.messages).load_only(
+                Message.id, Message.role, Message.content, Message.timestamp
+            ),
+            selectinload(Conversation.calendar_events).load_only(
+                CalendarEvent.id, CalendarEvent.google_event_id,
+                CalendarEvent.summary, CalendarEvent.start_time,
+                CalendarEvent.end_time, CalendarEvent.attendee_name,
+                CalendarEvent.html_link, CalendarEvent.created_at
+            )
+        ).filter(
             Conversation.id == conversation_id
         ).first()
     
@@ -63,22 +91,71 @@ class ConversationService:
         self,
         limit: int = 50,
         offset: int = 0,
-        user_id: Optional[int] = None
-    ) -> List[Conversation]:
-        """List conversations with pagination"""
-        query = self.db.query(Conversation)
-        
+        user_id: Optional[int] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+        eager: bool = False
+    ) -> List[Tuple[Conversation, int, int]]:
+        """
+        List conversations with pagination
+
+        Returns (conversation, message_count, events_created) tuples. The
+        counts are correlated scalar subqueries, so no message or event
+        rows are materialized just to measure their lengths.
+
+        `before` is a (started_at, id) keyset cursor: when given, the
+        query seeks directly to the page via the composite index instead
+        of scanning past `offset` rows, so deep pages stay constant-cost.
+
+        `eager` loads each conversation's messages and calendar events
+        with selectinload (one batched IN query per collection). The
+        collections are lazy="raise_on_sql", so callers that want them
+        must opt in here rather than trip per-row lazy loads.
+        """
+        message_count = (
+            self.db.query(func.count(Message.id))
+            .filter(Message.conversation_id == Conversation.id)
+            .correlate(Conversation)
+            .scalar_subquery()
+        )
+        events_created = (
+            self.db.query(func.count(CalendarEvent.id))
+            .filter(CalendarEvent.conversation_id == Conversation.id)
+            .correlate(Conversation)
+            .scalar_subquery()
+        )
+
+        query = self.db.query(Conversation, message_count, events_created).options(
+            load_only(
+                Conversation.id, Conversation.session_id, Conversation.status,
+                Conversation.started_at, Conversation.ended_at
+            )
+        )
+
+        if eager:
+            query = query.options(
+                selectinload(Conversation.messages),
+                selectinload(Conversation.calendar_events)
+            )
+
         if user_id:
             query = query.filter(Conversation.user_id == user_id)
-        
+
+        if before:
+            query = query.filter(
+                tuple_(Conversation.started_at, Conversation.id) < before
+            )
+        elif offset:
+            query = query.offset(offset)
+
         return query.order_by(
-            Conversation.started_at.desc()
-        ).offset(offset).limit(limit).all()
+            Conversation.started_at.desc(),
+            Conversation.id.desc()
+        ).limit(limit).all()
     
     def end_conversation(
         self,
         session_id: str,
-        status: ConversationStatus = ConversationStatus.COMPLETED
+        status: str = ConversationStatus.COMPLETED
     ) -> Optional[Conversation]:
         """End a conversation session"""
         conversation = self.get_conversation(session_id)
@@ -86,10 +163,10 @@ class ConversationService:
             conversation.status = status
             conversation.ended_at = datetime.utcnow()
             self.db.commit()
-            
+
             logger.info(
                 f"Conversation ended",
-                extra={"session_id": session_id, "status": status.value}
+                extra={"session_id": session_id, "status": status}
             )
         
         return conversation
@@ -99,42 +176,104 @@ class ConversationService:
         session_id: str,
         role: str,
         content: str
-    ) -> Optional[Message]:
-        """Add a message to a conversation"""
-        conversation = self.get_conversation(session_id)
-        if not conversation:
+    ) -> bool:
+        """
+        Add a message to a conversation
+
+        The INSERT selects the conversation id by session_id inside the
+        same statement, so the existence check and the write are one
+        atomic round-trip instead of SELECT-then-INSERT.
+
+        Returns:
+            True if stored, False if no such conversation exists
+        """
+        result = self.db.execute(
+            insert(Message).from_select(
+                ["conversation_id", "role", "content", "timestamp"],
+                select(
+                    Conversation.id,
+                    literal(role),
+                    literal(content),
+                    literal(datetime.utcnow())
+                ).where(Conversation.session_id == session_id)
+            )
+        )
+        self.db.commit()
+        
+        if result.rowcount == 0:
             logger.warning(f"Conversation not found: {session_id}")
-            return None
+            return False
         
-        message = Message(
-            conversation_id=conversation.id,
-            role=role,
-            content=content
-        )
+        # Per-message path: skip the extra-dict allocation outright
+        # when DEBUG is off
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Message added to conversation",
+                extra={"session_id": session_id, "role": role}
+            )
         
-        self.db.add(message)
-        self.db.commit()
-        self.db.refresh(message)
+        return True
+    
+    def add_messages_bulk(
+        self,
+        session_id: str,
+        rows: List[Tuple[str, str, datetime]]
+    ) -> int:
+        """
+        Insert buffered messages in a single statement
+
+        Args:
+            session_id: Conversation session ID
+            rows: (role, content, timestamp) tuples, with the timestamp
+                captured when each transcript arrived
+
+        One executemany INSERT and one commit replace a commit (and
+        fsync) per message; used by the WebSocket relay's flush timer.
+        """
+        if not rows:
+            return 0
+        
+        conversation_id = self.db.execute(
+            select(Conversation.id)
+            .where(Conversation.session_id == session_id)
+            .limit(1)
+        ).scalar_one_or_none()
+        if conversation_id is None:
+            logger.warning(f"Conversation not found: {session_id}")
+            return 0
         
-        logger.debug(
-            f"Message added to conversation",
-            extra={"session_id": session_id, "role": role}
+        self.db.execute(
+            insert(Message),
+            [
+                {
+                    "conversation_id": conversation_id,
+                    "role": role,
+                    "content": content,
+                    "timestamp": timestamp
+                }
+                for role, content, timestamp in rows
+            ]
         )
+        self.db.commit()
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Messages flushed to conversation",
+                extra={"session_id": session_id, "count": len(rows)}
+            )
         
-        return message
+        return len(rows)
     
     def get_messages(
         self,
         session_id: str,
         limit: int = 100
     ) -> List[Message]:
-        """Get messages for a conversation"""
-        conversation = self.get_conversation(session_id)
-        if not conversation:
-            return []
-        
-        return self.db.query(Message).filter(
-            Message.conversation_id == conversation.id
+        """Get messages for a conversation in one joined query"""
+        return self.db.query(Message).join(
+            Conversation, Conversation.id == Message.conversation_id
+        ).filter(
+            Conversation.session_id == session_id
         ).order_by(Message.timestamp.asc()).limit(limit).all()
     
     def add_calendar_event(
@@ -184,50 +323,89 @@ class ConversationService:
         self,
         limit: int = 50,
         offset: int = 0,
-        user_id: Optional[int] = None
+        user_id: Optional[int] = None,
+        before: Optional[Tuple[datetime, int]] = None
     ) -> List[CalendarEvent]:
-        """List calendar events, optionally filtered by user"""
-        query = self.db.query(CalendarEvent)
-        
+        """
+        List calendar events, optionally filtered by user
+
+        `before` is a (created_at, id) keyset cursor; see
+        list_conversations.
+        """
+        query = self.db.query(CalendarEvent).options(
+            load_only(
+                CalendarEvent.id, CalendarEvent.google_event_id,
+                CalendarEvent.summary, CalendarEvent.start_time,
+                CalendarEvent.end_time, CalendarEvent.attendee_name,
+                CalendarEvent.html_link, CalendarEvent.created_at
+            )
+        )
+
         # Filter by user if provided
         if user_id:
             query = query.join(Conversation).filter(Conversation.user_id == user_id)
-        
+
+        if before:
+            query = query.filter(
+                tuple_(CalendarEvent.created_at, CalendarEvent.id) < before
+            )
+        elif offset:
+            query = query.offset(offset)
+
         return query.order_by(
-            CalendarEvent.created_at.desc()
-        ).offset(offset).limit(limit).all()
+            CalendarEvent.created_at.desc(),
+            CalendarEvent.id.desc()
+        ).limit(limit).all()
     
     def get_conversation_stats(self, user_id: Optional[int] = None) -> dict:
         """
         Get conversation statistics
         
+        The per-status numbers come from one conditional aggregation
+        over conversations (COUNT(*) FILTER (WHERE status = ...)), so
+        the table is scanned once instead of once per status; events
+        and messages each take one more COUNT. Three queries total.
+        
+        Results are cached per user for 60 seconds; see the module
+        note on _stats_cache.
+        
         Args:
             user_id: Optional user ID to filter statistics by user
         """
-        query = self.db.query(Conversation)
-        events_query = self.db.query(CalendarEvent)
+        entry = _stats_cache.get(user_id)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+        
+        status_query = self.db.query(
+            func.count(Conversation.id),
+            func.count(Conversation.id).filter(
+                Conversation.status == ConversationStatus.ACTIVE
+            ),
+            func.count(Conversation.id).filter(
+                Conversation.status == ConversationStatus.COMPLETED
+            ),
+            func.count(Conversation.id).filter(
+                Conversation.status == ConversationStatus.ERROR
+            )
+        )
+        events_query = self.db.query(func.count(CalendarEvent.id))
+        messages_query = self.db.query(func.count(Message.id))
         
         # Filter by user if provided
         if user_id:
-            query = query.filter(Conversation.user_id == user_id)
-            events_query = events_query.join(Conversation).filter(Conversation.user_id == user_id)
+            status_query = status_query.filter(Conversation.user_id == user_id)
+            events_query = events_query.join(
+                Conversation, Conversation.id == CalendarEvent.conversation_id
+            ).filter(Conversation.user_id == user_id)
+            messages_query = messages_query.join(
+                Conversation, Conversation.id == Message.conversation_id
+            ).filter(Conversation.user_id == user_id)
         
-        total = query.count()
-        active = query.filter(Conversation.status == ConversationStatus.ACTIVE).count()
-        completed = query.filter(Conversation.status == ConversationStatus.COMPLETED).count()
-        errors = query.filter(Conversation.status == ConversationStatus.ERROR).count()
-        total_events = events_query.count()
-        
-        # Calculate total messages
-        total_messages = 0
-        if user_id:
-            conversations = query.all()
-            total_messages = sum(len(conv.messages) for conv in conversations)
-        else:
-            # For all users, count all messages
-            total_messages = self.db.query(Message).count()
+        total, active, completed, errors = status_query.one()
+        total_events = events_query.scalar()
+        total_messages = messages_query.scalar()
         
-        return {
+        stats = {
             "total_conversations": total,
             "active": active,
             "completed": completed,
@@ -235,3 +413,5 @@ class ConversationService:
             "total_calendar_events": total_events,
             "total_messages": total_messages
         }
+        _stats_cache[user_id] = (time.monotonic() + _STATS_CACHE_TTL, stats)
+        return stats
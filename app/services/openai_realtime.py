@@ -2,81 +2,39 @@
 OpenAI Realtime API service for voice interactions
 """
 
-import json
 from datetime import datetime
+from functools import lru_cache
 from typing import Callable, Any
 
-try:
-    import zoneinfo
-    HAS_ZONEINFO = True
-    HAS_PYTZ = False
-except ImportError:
-    try:
-        from backports import zoneinfo
-        HAS_ZONEINFO = True
-        HAS_PYTZ = False
-    except ImportError:
-        try:
-            import pytz
-            HAS_ZONEINFO = False
-            HAS_PYTZ = True
-        except ImportError:
-            HAS_ZONEINFO = False
-            HAS_PYTZ = False
+import orjson
+import zoneinfo
 
 from app.config import settings
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Configured zone resolved once at import; ZoneInfo construction parses
+# tzdata files and has no business in the per-connection path. Mirrors
+# the fallback behaviour in app.services.calendar.
+try:
+    _TZ = zoneinfo.ZoneInfo(settings.timezone)
+    _TZ_NAME = settings.timezone
+except (zoneinfo.ZoneInfoNotFoundError, ValueError) as e:
+    logger.warning(f"Failed to load timezone '{settings.timezone}', falling back to UTC: {e}")
+    _TZ = zoneinfo.ZoneInfo('UTC')
+    _TZ_NAME = 'UTC'
 
-def get_session_config() -> dict[str, Any]:
-    """
-    Get the session configuration for OpenAI Realtime API
-    
-    Returns:
-        Session configuration dictionary to send on connection
-    """
-    # Get current time in configured timezone
-    try:
-        if HAS_ZONEINFO:
-            tz = zoneinfo.ZoneInfo(settings.timezone)
-        elif HAS_PYTZ:
-            import pytz
-            tz = pytz.timezone(settings.timezone)
-        else:
-            tz = None
-            tz_name = 'UTC'
-            current_dt = datetime.now()
-        
-        if tz:
-            current_dt = datetime.now(tz)
-            tz_name = settings.timezone
-    except Exception:
-        try:
-            if HAS_ZONEINFO:
-                tz = zoneinfo.ZoneInfo('UTC')
-            elif HAS_PYTZ:
-                import pytz
-                tz = pytz.UTC
-            else:
-                tz = None
-            if tz:
-                current_dt = datetime.now(tz)
-            else:
-                current_dt = datetime.now()
-            tz_name = 'UTC'
-        except Exception:
-            current_dt = datetime.now()
-            tz_name = 'UTC'
-    
-    system_instructions = f"""You are a friendly voice assistant that helps users schedule calendar meetings.
+
+# Instruction prompt assembled once at import; _build_config fills the
+# live timestamp fields with format_map
+_INSTRUCTIONS_TEMPLATE = """You are a friendly voice assistant that helps users schedule calendar meetings.
 
 CURRENT DATE AND TIME (Timezone: {tz_name}):
-- Date: {current_dt.strftime('%Y-%m-%d')}
-- Time: {current_dt.strftime('%H:%M:%S %Z')}
-- Day: {current_dt.strftime('%A')}
-- ISO: {current_dt.isoformat()}
+- Date: {date}
+- Time: {time}
+- Day: {day}
+- ISO: {iso}
 - Timezone: {tz_name}
 
 When user says "tomorrow", add 1 day to current date.
@@ -101,6 +59,50 @@ IMPORTANT RULES:
 - Confirm before creating any event
 - If the user wants to change something, accommodate them before creating the event"""
 
+
+def get_session_config() -> dict[str, Any]:
+    """
+    Get the session configuration for OpenAI Realtime API
+    
+    The embedded date/time is floored to the minute so back-to-back
+    connections share one memoized config instead of rebuilding the
+    instruction prompt and tools schema each time. Callers must treat
+    the returned dict as read-only.
+    
+    Returns:
+        Session configuration dictionary to send on connection
+    """
+    current_dt = datetime.now(_TZ).replace(second=0, microsecond=0)
+    return _build_config(
+        _TZ_NAME,
+        current_dt.strftime('%Y-%m-%d'),
+        current_dt.strftime('%H:%M:%S %Z'),
+        current_dt.strftime('%A'),
+        current_dt.isoformat()
+    )
+
+
+@lru_cache(maxsize=8)
+def _build_config(
+    tz_name: str,
+    date_str: str,
+    time_str: str,
+    day_str: str,
+    iso_str: str
+) -> dict[str, Any]:
+    """Assemble (and memoize) the session.update payload.
+
+    Keyed on the formatted minute-granular timestamp strings, so within
+    any one minute every connection reuses the same dict.
+    """
+    system_instructions = _INSTRUCTIONS_TEMPLATE.format_map({
+        "tz_name": tz_name,
+        "date": date_str,
+        "time": time_str,
+        "day": day_str,
+        "iso": iso_str
+    })
+
     tools = [
         {
             "type": "function",
@@ -166,20 +168,56 @@ def get_websocket_headers() -> dict[str, str]:
     }
 
 
+async def _handle_add_calendar_event(
+    args: dict[str, Any],
+    calendar_service: Any,
+    session_id: str
+) -> dict[str, Any]:
+    """Tool handler: create a calendar event from confirmed details"""
+    result = calendar_service.add_event(
+        summary=args.get("summary", "Meeting"),
+        start_time=args.get("start_time"),
+        end_time=args.get("end_time"),
+        description=args.get("description"),
+        attendee_name=args.get("attendee_name")
+    )
+    
+    logger.info(
+        "Calendar event function result",
+        extra={
+            "session_id": session_id,
+            "success": result.get("success", False),
+            "event_id": result.get("event_id")
+        }
+    )
+    return result
+
+
+# Tool-name -> handler dispatch table; new tools register here and in
+# the _build_config tools schema
+_FUNCTION_HANDLERS: dict[str, Callable] = {
+    "add_calendar_event": _handle_add_calendar_event,
+}
+
+
 async def handle_function_call(
     call_id: str,
     name: str,
-    arguments: str,
+    arguments: "str | dict[str, Any]",
     calendar_service: Any,
     session_id: str = None
 ) -> dict[str, Any]:
     """
     Handle function calls from the OpenAI assistant
     
+    Dispatches through _FUNCTION_HANDLERS, so adding a tool is a new
+    handler plus a dict entry rather than another elif branch.
+    
     Args:
         call_id: Function call ID from OpenAI
         name: Function name
-        arguments: JSON string of function arguments
+        arguments: Function arguments, either a JSON string or a dict
+            the caller already decoded (so the payload is parsed once)
         calendar_service: CalendarService instance
         session_id: Current session ID for logging
         
@@ -191,31 +229,18 @@ async def handle_function_call(
         extra={"session_id": session_id, "call_id": call_id}
     )
     
-    try:
-        args = json.loads(arguments)
-    except json.JSONDecodeError:
-        logger.error(f"Invalid function arguments: {arguments}")
-        args = {}
-    
-    if name == "add_calendar_event":
-        result = calendar_service.add_event(
-            summary=args.get("summary", "Meeting"),
-            start_time=args.get("start_time"),
-            end_time=args.get("end_time"),
-            description=args.get("description"),
-            attendee_name=args.get("attendee_name")
-        )
-        
-        logger.info(
-            f"Calendar event function result",
-            extra={
-                "session_id": session_id,
-                "success": result.get("success", False),
-                "event_id": result.get("event_id")
-            }
-        )
+    if isinstance(arguments, dict):
+        args = arguments
     else:
-        result = {"error": f"Unknown function: {name}"}
+        try:
+            args = orjson.loads(arguments)
+        except orjson.JSONDecodeError:
+            logger.error(f"Invalid function arguments: {arguments}")
+            args = {}
+    
+    handler = _FUNCTION_HANDLERS.get(name)
+    if handler is None:
         logger.warning(f"Unknown function called: {name}")
+        return {"error": f"Unknown function: {name}"}
     
-    return result
+    return await handler(args, calendar_service, session_id)
@@ -3,16 +3,37 @@ User service for managing users and user sessions
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import NamedTuple, Optional
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.models import User
-from app.utils.session import create_session, get_user_from_session, delete_session
+from app.utils.session import (
+    create_session,
+    get_user_from_session,
+    delete_session,
+    get_cached_session_identity,
+    cache_session_user_id,
+    invalidate_cached_session,
+    resolve_session_identity,
+)
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+class SessionIdentity(NamedTuple):
+    """Lightweight (user_id, email) pair resolved from a session token.
+
+    Handed out by the TTL cache instead of a live ORM User so hot paths
+    (auth polling, WebSocket connects) never attach an object to the
+    request's database session just to read two columns.
+    """
+    user_id: int
+    email: Optional[str]
+
+
 class UserService:
     """Service for user management"""
     
@@ -23,27 +44,31 @@ class UserService:
         """
         Get existing user by email or create new user
         
+        A single INSERT ... ON CONFLICT(email) DO UPDATE replaces the
+        SELECT-then-INSERT/UPDATE pair: one round-trip on every login,
+        and race-free when two logins for the same address land
+        concurrently.
+        
         Args:
             email: User's email address
             
         Returns:
             User object
         """
-        user = self.db.query(User).filter(User.email == email).first()
-        
-        if not user:
-            user = User(email=email)
-            self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
-            logger.info(f"New user created: {email}")
-        else:
-            # Update last login
-            user.last_login = datetime.utcnow()
-            self.db.commit()
-            logger.debug(f"Existing user logged in: {email}")
+        stmt = (
+            sqlite_insert(User)
+            .values(email=email)
+            .on_conflict_do_update(
+                index_elements=[User.email],
+                set_={"last_login": func.now()}
+            )
+            .returning(User.id)
+        )
+        user_id = self.db.execute(stmt).scalar_one()
+        self.db.commit()
         
-        return user
+        logger.debug(f"User upserted: {email}")
+        return self.db.get(User, user_id)
     
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID"""
@@ -64,7 +89,29 @@ class UserService:
             User object if session is valid, None otherwise
         """
         return get_user_from_session(self.db, session_token)
-    
+
+    def get_session_identity(
+        self, session_token: Optional[str]
+    ) -> Optional[SessionIdentity]:
+        """
+        Resolve a session token to (user_id, email) via the TTL cache
+
+        On a cache hit this is a dict lookup; on a miss it queries once
+        and caches the result (including "no user") for the TTL window.
+        Prefer this over get_user_from_session_token on paths that only
+        read the id and email.
+        """
+        if not session_token:
+            return None
+
+        hit, user_id, email = get_cached_session_identity(session_token)
+        if hit:
+            return SessionIdentity(user_id, email) if user_id else None
+
+        user_id, email = resolve_session_identity(self.db, session_token)
+        cache_session_user_id(session_token, user_id, email)
+        return SessionIdentity(user_id, email) if user_id else None
+
     def create_user_session(self, user_id: Optional[int] = None) -> str:
         """
         Create a new session for a user
@@ -76,6 +123,11 @@ class UserService:
             Session token string
         """
         session = create_session(self.db, user_id=user_id)
+        if user_id is not None:
+            user = self.get_user_by_id(user_id)
+            cache_session_user_id(
+                session.session_token, user_id, user.email if user else None
+            )
         return session.session_token
     
     def delete_user_session(self, session_token: str) -> bool:
@@ -88,6 +140,7 @@ class UserService:
         Returns:
             True if deleted, False if not found
         """
+        invalidate_cached_session(session_token)
         return delete_session(self.db, session_token)
     
     def update_user_token(self, user_id: int, encrypted_token: str) -> bool:
@@ -3,7 +3,7 @@ Token encryption utilities using Fernet symmetric encryption
 """
 
 import base64
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
@@ -41,16 +41,19 @@ def encrypt_token(token_data: bytes) -> str:
     """
     Encrypt OAuth token data
     
+    Fernet output is already URL-safe base64, so it is stored as-is;
+    wrapping it in a second base64 pass (as earlier versions did) only
+    added an encode/decode per call and ~33% column growth.
+    
     Args:
-        token_data: Pickled credentials bytes
+        token_data: Serialized credentials bytes
         
     Returns:
-        Base64-encoded encrypted string
+        Fernet token string
     """
     try:
         fernet = get_fernet()
-        encrypted = fernet.encrypt(token_data)
-        return base64.urlsafe_b64encode(encrypted).decode('utf-8')
+        return fernet.encrypt(token_data).decode('ascii')
     except Exception as e:
         logger.error(f"Error encrypting token: {e}")
         raise
@@ -61,16 +64,21 @@ def decrypt_token(encrypted_token: str) -> bytes:
     Decrypt OAuth token data
     
     Args:
-        encrypted_token: Base64-encoded encrypted string
+        encrypted_token: Fernet token string (legacy rows carry an
+            extra base64 wrapping, handled transparently)
         
     Returns:
-        Decrypted pickled credentials bytes
+        Decrypted serialized credentials bytes
     """
     try:
         fernet = get_fernet()
-        encrypted_bytes = base64.urlsafe_b64decode(encrypted_token.encode('utf-8'))
-        decrypted = fernet.decrypt(encrypted_bytes)
-        return decrypted
+        encrypted_bytes = encrypted_token.encode('ascii')
+        try:
+            return fernet.decrypt(encrypted_bytes)
+        except InvalidToken:
+            # Legacy format: base64(fernet_token). Rows re-encrypt in
+            # the new format the next time save_credentials runs.
+            return fernet.decrypt(base64.urlsafe_b64decode(encrypted_bytes))
     except Exception as e:
         logger.error(f"Error decrypting token: {e}")
         raise
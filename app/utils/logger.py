@@ -3,44 +3,58 @@ Structured logging configuration with rotation and JSON formatting
 """
 
 import os
+import queue
 import sys
+import time
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
-import json
 from typing import Any
 
+import orjson
+
 from app.config import settings
 
+# Background listener that formats and writes records off the request
+# path; started by setup_logging, stopped via shutdown_logging
+_queue_listener: QueueListener | None = None
+
+
+# Extra context fields copied onto log records via logger(..., extra=...)
+_EXTRA_FIELDS = ("session_id", "client_ip", "user_id", "event_type", "duration_ms")
+
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
     
     def format(self, record: logging.LogRecord) -> str:
+        # Reuse the creation time already captured on the record rather
+        # than allocating a fresh datetime per line
+        created = record.created
+        timestamp = (
+            time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(created))
+            + f".{int((created % 1) * 1_000_000):06d}Z"
+        )
         log_data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": timestamp,
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
         
-        # Add extra fields if present
-        if hasattr(record, "session_id"):
-            log_data["session_id"] = record.session_id
-        if hasattr(record, "client_ip"):
-            log_data["client_ip"] = record.client_ip
-        if hasattr(record, "user_id"):
-            log_data["user_id"] = record.user_id
-        if hasattr(record, "event_type"):
-            log_data["event_type"] = record.event_type
-        if hasattr(record, "duration_ms"):
-            log_data["duration_ms"] = record.duration_ms
+        # Add extra fields if present; one dict.get per field instead
+        # of hasattr's attribute machinery
+        record_dict = record.__dict__
+        for key in _EXTRA_FIELDS:
+            value = record_dict.get(key)
+            if value is not None:
+                log_data[key] = value
         
         # Add exception info if present
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
         
-        return json.dumps(log_data)
+        return orjson.dumps(log_data).decode()
 
 
 class ConsoleFormatter(logging.Formatter):
@@ -63,13 +77,17 @@ class ConsoleFormatter(logging.Formatter):
         message = f"{color}[{timestamp}] {record.levelname:8}{self.RESET} | {record.name} | {record.getMessage()}"
         
         # Add extra context
+        record_dict = record.__dict__
         extras = []
-        if hasattr(record, "session_id"):
-            extras.append(f"session={record.session_id}")
-        if hasattr(record, "client_ip"):
-            extras.append(f"ip={record.client_ip}")
-        if hasattr(record, "duration_ms"):
-            extras.append(f"duration={record.duration_ms}ms")
+        session_id = record_dict.get("session_id")
+        if session_id is not None:
+            extras.append(f"session={session_id}")
+        client_ip = record_dict.get("client_ip")
+        if client_ip is not None:
+            extras.append(f"ip={client_ip}")
+        duration_ms = record_dict.get("duration_ms")
+        if duration_ms is not None:
+            extras.append(f"duration={duration_ms}ms")
         
         if extras:
             message += f" | {' '.join(extras)}"
@@ -82,20 +100,29 @@ class ConsoleFormatter(logging.Formatter):
 
 
 def setup_logging() -> None:
-    """Setup application logging with console and file handlers"""
-    
+    """Setup application logging with console and file handlers
+
+    Handlers are driven by a QueueListener on a background thread, so a
+    logger.info() call on the request path is just a queue put - JSON
+    formatting and file/console writes happen off the hot path.
+    """
+    global _queue_listener
+
     # Ensure logs directory exists
     log_dir = os.path.dirname(settings.log_file)
     if log_dir:
         os.makedirs(log_dir, exist_ok=True)
-    
+
     # Get root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, settings.log_level.upper()))
-    
+
     # Clear existing handlers
     root_logger.handlers.clear()
-    
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
     # Console handler (colored for development)
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
@@ -103,8 +130,7 @@ def setup_logging() -> None:
         console_handler.setFormatter(ConsoleFormatter())
     else:
         console_handler.setFormatter(JSONFormatter())
-    root_logger.addHandler(console_handler)
-    
+
     # File handler (JSON format with rotation)
     file_handler = RotatingFileHandler(
         settings.log_file,
@@ -114,8 +140,7 @@ def setup_logging() -> None:
     )
     file_handler.setLevel(logging.INFO)
     file_handler.setFormatter(JSONFormatter())
-    root_logger.addHandler(file_handler)
-    
+
     # Error file handler (separate file for errors)
     error_log_file = settings.log_file.replace(".log", ".error.log")
     error_handler = RotatingFileHandler(
@@ -126,8 +151,20 @@ def setup_logging() -> None:
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(JSONFormatter())
-    root_logger.addHandler(error_handler)
-    
+
+    # Emitters attach to the listener; the root logger only ever sees
+    # the (fast, non-blocking) QueueHandler
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    _queue_listener = QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        error_handler,
+        respect_handler_level=True
+    )
+    _queue_listener.start()
+
     # Set levels for noisy third-party loggers
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("websockets").setLevel(logging.WARNING)
@@ -136,6 +173,14 @@ def setup_logging() -> None:
     logging.getLogger("googleapiclient").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Stop the queue listener, flushing any queued records"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance with the given name"""
     return logging.getLogger(name)
@@ -3,17 +3,142 @@ Session management utilities
 """
 
 import secrets
+import time
 from datetime import datetime, timedelta
 from typing import Optional
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session as DBSession
 
+from app.config import settings
 from app.models import Session as SessionModel, User
 from app.utils.logger import get_logger
 
+# Optional Redis backend for the session store
+try:
+    import redis as _redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
 logger = get_logger(__name__)
 
 # Session expiration (30 days)
 SESSION_EXPIRATION_DAYS = 30
+_SESSION_TTL = timedelta(days=SESSION_EXPIRATION_DAYS)
+
+# last_used_at is bookkeeping, not security state; rewriting it on
+# every lookup made each authenticated read a write transaction (WAL
+# fsync included). Only touch it when it has drifted this far.
+_LAST_USED_REFRESH = timedelta(minutes=5)
+
+
+class RedisSessionStore:
+    """Session token -> identity mapping kept in Redis.
+
+    Session records are high-churn, low-value data: pushing them to a
+    key-value store with a TTL takes the hottest table out of the
+    relational database entirely - lookups become a sub-millisecond
+    GET and expiry is handled by Redis instead of cleanup sweeps.
+    Values are stored as "user_id:email" ("": anonymous).
+    """
+
+    def __init__(self, url: str):
+        self._client = _redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, session_token: str) -> Optional[tuple[Optional[int], Optional[str]]]:
+        """Return (user_id, email) for a live token, None if absent"""
+        value = self._client.get(f"session:{session_token}")
+        if value is None:
+            return None
+        user_part, _, email = value.partition(":")
+        return (int(user_part) if user_part else None, email or None)
+
+    def put(
+        self,
+        session_token: str,
+        user_id: Optional[int],
+        email: Optional[str],
+        ttl: int = SESSION_EXPIRATION_DAYS * 24 * 60 * 60
+    ) -> None:
+        value = f"{user_id if user_id is not None else ''}:{email or ''}"
+        self._client.setex(f"session:{session_token}", ttl, value)
+
+    def delete(self, session_token: str) -> None:
+        self._client.delete(f"session:{session_token}")
+
+
+# Built once at import; None means "relational sessions only". Writes
+# below go to both stores while reads prefer Redis, so a deployment can
+# flip the setting either way without stranding live sessions.
+session_store: Optional[RedisSessionStore] = (
+    RedisSessionStore(settings.redis_url)
+    if HAS_REDIS and settings.redis_url else None
+)
+
+# In-process TTL cache for session-token -> user resolution. Dashboard
+# clients resolve the same token dozens of times per minute; a short TTL
+# saves those repeat SELECTs while bounding how long a revoked session
+# can linger. Values map token -> (monotonic deadline, user_id or None,
+# email or None).
+_SESSION_CACHE_TTL = 30.0
+_SESSION_CACHE_MAX = 10_000
+_session_user_cache: dict[str, tuple[float, Optional[int], Optional[str]]] = {}
+
+
+def get_cached_session_user_id(session_token: str) -> tuple[bool, Optional[int]]:
+    """
+    Look up a session token in the TTL cache
+
+    Returns:
+        (hit, user_id) - hit is False if absent or expired
+    """
+    hit, user_id, _email = get_cached_session_identity(session_token)
+    return hit, user_id
+
+
+def get_cached_session_identity(
+    session_token: str
+) -> tuple[bool, Optional[int], Optional[str]]:
+    """
+    Look up a session token in the TTL cache
+
+    Returns:
+        (hit, user_id, email) - hit is False if absent or expired
+    """
+    entry = _session_user_cache.get(session_token)
+    if entry is None:
+        return False, None, None
+    deadline, user_id, email = entry
+    if time.monotonic() > deadline:
+        _session_user_cache.pop(session_token, None)
+        return False, None, None
+    return True, user_id, email
+
+
+def cache_session_user_id(
+    session_token: str,
+    user_id: Optional[int],
+    email: Optional[str] = None
+) -> None:
+    """Cache a resolved session token (including 'no user' results)"""
+    if len(_session_user_cache) >= _SESSION_CACHE_MAX:
+        # Drop expired entries first; fall back to clearing outright
+        now = time.monotonic()
+        for token in [
+            t for t, entry in _session_user_cache.items() if entry[0] < now
+        ]:
+            _session_user_cache.pop(token, None)
+        if len(_session_user_cache) >= _SESSION_CACHE_MAX:
+            _session_user_cache.clear()
+    _session_user_cache[session_token] = (
+        time.monotonic() + _SESSION_CACHE_TTL, user_id, email
+    )
+
+
+def invalidate_cached_session(session_token: Optional[str]) -> None:
+    """Drop a token from the TTL cache (logout)"""
+    if session_token:
+        _session_user_cache.pop(session_token, None)
 
 
 def generate_session_token() -> str:
@@ -36,7 +161,7 @@ def create_session(
         Created Session object
     """
     session_token = generate_session_token()
-    expires_at = datetime.utcnow() + timedelta(days=SESSION_EXPIRATION_DAYS)
+    expires_at = datetime.utcnow() + _SESSION_TTL
     
     session = SessionModel(
         session_token=session_token,
@@ -48,6 +173,12 @@ def create_session(
     db.commit()
     db.refresh(session)
     
+    if session_store:
+        try:
+            session_store.put(session_token, user_id, None)
+        except Exception as e:
+            logger.warning(f"Redis session write failed: {e}")
+    
     logger.info(f"Session created", extra={"session_token": session_token[:8], "user_id": user_id})
     
     return session
@@ -80,9 +211,12 @@ def get_session(
         delete_session(db, session_token)
         return None
     
-    # Update last_used_at
-    session.last_used_at = datetime.utcnow()
-    db.commit()
+    # Touch last_used_at only when it is stale enough to matter, so
+    # routine lookups stay read-only
+    now = datetime.utcnow()
+    if session.last_used_at is None or now - session.last_used_at > _LAST_USED_REFRESH:
+        session.last_used_at = now
+        db.commit()
     
     return session
 
@@ -111,6 +245,73 @@ def get_user_from_session(
     return db.query(User).filter(User.id == session.user_id).first()
 
 
+def resolve_session_identity(
+    db: DBSession,
+    session_token: str
+) -> tuple[Optional[int], Optional[str]]:
+    """
+    Resolve a session token to (user_id, email) with one trimmed query
+
+    Selects just the three columns the callers read instead of loading
+    full Session and User ORM objects through the identity map; the
+    unique token index lets the scan stop after one row. Expired
+    sessions are deleted, and last_used_at is touched with a direct
+    UPDATE (no ORM flush).
+
+    Returns:
+        (user_id, email) - both None if the session is missing, expired
+        or anonymous
+    """
+    if session_store:
+        try:
+            identity = session_store.get(session_token)
+        except Exception as e:
+            logger.warning(f"Redis session read failed: {e}")
+        else:
+            if identity is not None:
+                return identity
+    
+    now = datetime.utcnow()
+    row = db.execute(
+        select(
+            SessionModel.user_id, SessionModel.expires_at,
+            SessionModel.last_used_at, User.email
+        )
+        .outerjoin(User, User.id == SessionModel.user_id)
+        .where(SessionModel.session_token == session_token)
+        .limit(1)
+    ).first()
+    
+    if row is None:
+        return None, None
+    
+    if now > row.expires_at:
+        logger.debug(f"Session expired: {session_token[:8]}")
+        delete_session(db, session_token)
+        return None, None
+    
+    # Throttled bookkeeping write; see _LAST_USED_REFRESH
+    if row.last_used_at is None or now - row.last_used_at > _LAST_USED_REFRESH:
+        db.execute(
+            update(SessionModel)
+            .where(SessionModel.session_token == session_token)
+            .values(last_used_at=now)
+        )
+        db.commit()
+    
+    if session_store:
+        # Backfill so the next lookup is served from Redis
+        try:
+            session_store.put(
+                session_token, row.user_id, row.email,
+                ttl=max(int((row.expires_at - now).total_seconds()), 1)
+            )
+        except Exception as e:
+            logger.warning(f"Redis session write failed: {e}")
+    
+    return row.user_id, row.email
+
+
 def delete_session(
     db: DBSession,
     session_token: str
@@ -125,13 +326,22 @@ def delete_session(
     Returns:
         True if session was deleted, False if not found
     """
-    session = db.query(SessionModel).filter(
-        SessionModel.session_token == session_token
-    ).first()
+    invalidate_cached_session(session_token)
     
-    if session:
-        db.delete(session)
-        db.commit()
+    if session_store:
+        try:
+            session_store.delete(session_token)
+        except Exception as e:
+            logger.warning(f"Redis session delete failed: {e}")
+    
+    # Single DELETE; sessions have no dependent rows, so there is
+    # nothing for ORM cascade handling to do
+    result = db.execute(
+        delete(SessionModel).where(SessionModel.session_token == session_token)
+    )
+    db.commit()
+    
+    if result.rowcount:
         logger.info(f"Session deleted: {session_token[:8]}")
         return True
     
@@ -149,14 +359,12 @@ def cleanup_expired_sessions(db: DBSession) -> int:
         Number of sessions deleted
     """
     now = datetime.utcnow()
-    expired = db.query(SessionModel).filter(
+    # One bulk DELETE instead of loading every expired row and issuing
+    # a per-row delete; synchronize_session=False skips identity-map
+    # bookkeeping no caller relies on
+    count = db.query(SessionModel).filter(
         SessionModel.expires_at < now
-    ).all()
-    
-    count = len(expired)
-    for session in expired:
-        db.delete(session)
-    
+    ).delete(synchronize_session=False)
     db.commit()
     
     if count > 0:
@@ -0,0 +1,1220 @@
+"""
+Voice Scheduling Agent - legacy standalone FastAPI server
+WebSocket relay between browser and OpenAI Realtime API with Google Calendar integration
+
+Named legacy_app (not app) so it stays importable: the app/ package of
+the current server shadows any top-level app.py on import, and
+multi-worker uvicorn has to import this module by name.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel, ValidationError
+
+import aiohttp
+import orjson
+
+# Google Calendar
+import google_auth_httplib2
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import Flow
+from googleapiclient.discovery import build
+from googleapiclient.http import build_http
+from google.auth.transport.requests import Request as GoogleRequest
+
+from app.database import SessionLocal, init_db
+from app.models import GoogleToken
+
+# ==================== CONFIGURATION ====================
+
+# Load from environment variables - no hardcoded fallbacks for security
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+if not OPENAI_API_KEY:
+    raise ValueError(
+        "OPENAI_API_KEY environment variable is required. "
+        "Please set it in your .env file or environment."
+    )
+
+REALTIME_API_URL = os.environ.get(
+    "OPENAI_REALTIME_URL",
+    "wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview-2024-12-17"
+)
+
+# Google OAuth2 Credentials - must be set via environment variables
+GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID")
+if not GOOGLE_CLIENT_ID:
+    raise ValueError(
+        "GOOGLE_CLIENT_ID environment variable is required. "
+        "Please set it in your .env file or environment."
+    )
+
+GOOGLE_CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET")
+if not GOOGLE_CLIENT_SECRET:
+    raise ValueError(
+        "GOOGLE_CLIENT_SECRET environment variable is required. "
+        "Please set it in your .env file or environment."
+    )
+
+GOOGLE_REDIRECT_URI = os.environ.get(
+    "GOOGLE_REDIRECT_URI",
+    "http://localhost:8000/auth/callback"
+)
+SCOPES = ['https://www.googleapis.com/auth/calendar']
+
+# Allow HTTP for localhost
+os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
+
+# ==================== FASTAPI APP ====================
+
+app = FastAPI(title="Voice Scheduling Agent")
+
+# Mount static files
+app.mount("/static", StaticFiles(directory="static"), name="static")
+
+# Shared aiohttp session so the TLS session and DNS cache survive reconnects
+_http_session = None
+
+
+async def _get_http_session() -> "aiohttp.ClientSession":
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession()
+    return _http_session
+
+
+@app.on_event("shutdown")
+async def _close_http_session():
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+
+
+# ==================== GOOGLE CALENDAR ====================
+
+# Tokens live in the SQLite DB from app/database.py (a single row, since
+# this server authenticates one calendar) so every worker process sees
+# the same credentials
+
+def _load_creds_sync():
+    """Read stored Google credentials from the database"""
+    db = SessionLocal()
+    try:
+        row = db.query(GoogleToken).first()
+    finally:
+        db.close()
+    if row is None:
+        return None
+    creds = Credentials(
+        token=row.token,
+        refresh_token=row.refresh_token,
+        token_uri=row.token_uri,
+        client_id=row.client_id,
+        client_secret=row.client_secret,
+        scopes=json.loads(row.scopes) if row.scopes else None,
+    )
+    creds.expiry = row.expiry
+    return creds
+
+
+def _save_creds_sync(creds):
+    """Upsert the stored Google credentials row"""
+    db = SessionLocal()
+    try:
+        row = db.query(GoogleToken).first()
+        if row is None:
+            row = GoogleToken()
+            db.add(row)
+        row.token = creds.token
+        row.refresh_token = creds.refresh_token
+        row.token_uri = creds.token_uri
+        row.client_id = creds.client_id
+        row.client_secret = creds.client_secret
+        row.scopes = json.dumps(creds.scopes) if creds.scopes else None
+        row.expiry = creds.expiry
+        db.commit()
+    finally:
+        db.close()
+
+
+def _delete_creds_sync():
+    """Remove any stored Google credentials (logout)"""
+    db = SessionLocal()
+    try:
+        db.query(GoogleToken).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _load_creds_async():
+    """Load Google credentials without blocking the event loop"""
+    return await asyncio.to_thread(_load_creds_sync)
+
+
+async def _save_creds_async(creds):
+    """Persist Google credentials without blocking the event loop"""
+    await asyncio.to_thread(_save_creds_sync, creds)
+
+
+async def get_google_credentials():
+    """Load Google credentials, refreshing them if expired"""
+    creds = await _load_creds_async()
+    if creds and creds.valid:
+        return creds
+    if creds and creds.expired and creds.refresh_token:
+        # google-auth refreshes over blocking HTTP - keep it off the loop
+        await asyncio.to_thread(creds.refresh, GoogleRequest())
+        await _save_creds_async(creds)
+        return creds
+    return None
+
+
+# In-process auth cache: avoid re-reading token.json and re-building the
+# discovery client (which fetches the discovery document) on every tool call
+_auth_state = {"creds": None, "service": None, "lock": asyncio.Lock()}
+_REFRESH_MARGIN = timedelta(seconds=300)
+
+
+def _needs_refresh(creds):
+    """True if credentials are invalid or expire within the refresh margin"""
+    if not creds.valid:
+        return True
+    # google-auth expiry is a naive UTC datetime
+    return creds.expiry is not None and creds.expiry - datetime.utcnow() < _REFRESH_MARGIN
+
+
+def _invalidate_auth_cache():
+    """Drop the cached credentials/service (after login or logout)"""
+    _auth_state["creds"] = None
+    _auth_state["service"] = None
+
+
+async def get_calendar_service():
+    """Get authenticated Google Calendar service (cached across calls)"""
+    creds = _auth_state["creds"]
+    if creds and _auth_state["service"] and not _needs_refresh(creds):
+        return _auth_state["service"]
+
+    async with _auth_state["lock"]:
+        # Re-check under the lock so concurrent callers coalesce into one refresh
+        creds = _auth_state["creds"]
+        if creds and _auth_state["service"] and not _needs_refresh(creds):
+            return _auth_state["service"]
+
+        creds = creds or await _load_creds_async()
+        if not creds:
+            _invalidate_auth_cache()
+            return None
+
+        if _needs_refresh(creds):
+            if not creds.refresh_token:
+                _invalidate_auth_cache()
+                return None
+            await asyncio.to_thread(creds.refresh, GoogleRequest())
+            await _save_creds_async(creds)
+
+        _auth_state["creds"] = creds
+        # static_discovery skips the discovery-document HTTP fetch
+        _auth_state["service"] = build(
+            'calendar', 'v3', credentials=creds,
+            cache_discovery=False, static_discovery=True
+        )
+        return _auth_state["service"]
+
+
+async def _auth_refresh_loop():
+    """Proactively refresh credentials before expiry, outside the request path"""
+    while True:
+        await asyncio.sleep(60)
+        creds = _auth_state["creds"]
+        if creds and _needs_refresh(creds):
+            try:
+                await get_calendar_service()
+            except Exception as e:
+                print(f"[Auth Refresh Error] {e}")
+
+
+@app.on_event("startup")
+async def _start_auth_refresh():
+    await asyncio.to_thread(init_db)
+    asyncio.create_task(_auth_refresh_loop())
+
+
+try:
+    # Hand-written C parser, much faster than datetime.fromisoformat and
+    # handles RFC3339 'Z' suffixes natively
+    import ciso8601
+    _parse_iso8601 = ciso8601.parse_datetime
+except ImportError:
+    def _parse_iso8601(value):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _build_event(summary: str, start_time: str, end_time: str = None,
+                 description: str = None, attendee_name: str = None):
+    """Build a Google Calendar event body from tool-call arguments"""
+    # Parse start_time
+    try:
+        start_dt = _parse_iso8601(start_time)
+    except (ValueError, TypeError):
+        start_dt = datetime.now() + timedelta(hours=1)
+
+    # Calculate end time
+    if end_time:
+        try:
+            end_dt = _parse_iso8601(end_time)
+        except (ValueError, TypeError):
+            end_dt = start_dt + timedelta(hours=1)
+    else:
+        end_dt = start_dt + timedelta(hours=1)
+
+    # Build description
+    event_description = description or ""
+    if attendee_name:
+        event_description = f"Meeting with {attendee_name}\n{event_description}".strip()
+
+    return {
+        'summary': summary,
+        'description': event_description,
+        'start': {'dateTime': start_dt.isoformat(), 'timeZone': 'UTC'},
+        'end': {'dateTime': end_dt.isoformat(), 'timeZone': 'UTC'},
+    }
+
+
+def _event_result(created_event, summary: str):
+    """Build the tool result dict for a created event"""
+    return {
+        "success": True,
+        "event_id": created_event.get('id'),
+        "summary": created_event.get('summary'),
+        "start": created_event.get('start', {}).get('dateTime'),
+        "html_link": created_event.get('htmlLink'),
+        "message": f"Event '{summary}' created successfully!"
+    }
+
+
+NOT_AUTHENTICATED_ERROR = {
+    "error": "Google Calendar not authenticated. Please connect your calendar first."
+}
+
+
+def _thread_http():
+    """Fresh authorized transport for one threaded execute.
+
+    The cached service's built-in httplib2 transport shares per-host
+    connection objects and is not thread-safe, but tool calls run their
+    executes concurrently in worker threads. Giving each execute its own
+    AuthorizedHttp keeps the shared service for URL building only, so
+    parallel calls cannot interleave on one HTTPS connection.
+    """
+    return google_auth_httplib2.AuthorizedHttp(
+        _auth_state["creds"], http=build_http()
+    )
+
+
+async def add_calendar_event(summary: str, start_time: str, end_time: str = None,
+                             description: str = None, attendee_name: str = None):
+    """Add an event to Google Calendar"""
+    service = await get_calendar_service()
+    if not service:
+        return dict(NOT_AUTHENTICATED_ERROR)
+
+    try:
+        event = _build_event(summary, start_time, end_time, description, attendee_name)
+        # googleapiclient uses blocking httplib2 - keep the insert off the
+        # loop, on a per-call transport (see _thread_http)
+        request = service.events().insert(calendarId='primary', body=event)
+        created_event = await asyncio.to_thread(request.execute, http=_thread_http())
+        return _event_result(created_event, summary)
+    except Exception as e:
+        return {"error": f"Failed to create calendar event: {str(e)}"}
+
+
+async def add_calendar_events_batch(args_list):
+    """
+    Insert several events with a single batched HTTP request.
+
+    Collapses N events().insert() round-trips into one call to the Calendar
+    batch endpoint. Returns one result dict per entry, in input order.
+    """
+    service = await get_calendar_service()
+    if not service:
+        return [dict(NOT_AUTHENTICATED_ERROR) for _ in args_list]
+
+    results = {}
+
+    def _on_event_created(request_id, response, exception):
+        if exception is not None:
+            results[request_id] = {"error": f"Failed to create calendar event: {exception}"}
+        else:
+            results[request_id] = _event_result(response, response.get('summary', ''))
+
+    batch = service.new_batch_http_request(callback=_on_event_created)
+    for i, args in enumerate(args_list):
+        event = _build_event(
+            summary=args.get("summary", "Meeting"),
+            start_time=args.get("start_time"),
+            end_time=args.get("end_time"),
+            description=args.get("description"),
+            attendee_name=args.get("attendee_name")
+        )
+        batch.add(
+            service.events().insert(calendarId='primary', body=event),
+            request_id=str(i)
+        )
+
+    try:
+        # batch.execute uses blocking HTTP - keep it off the loop, on a
+        # per-call transport (see _thread_http)
+        await asyncio.to_thread(batch.execute, http=_thread_http())
+    except Exception as e:
+        return [{"error": f"Failed to create calendar event: {str(e)}"} for _ in args_list]
+
+    return [
+        results.get(str(i), {"error": "No response for batched event"})
+        for i in range(len(args_list))
+    ]
+
+
+# ==================== ROUTES ====================
+
+@app.get("/", response_class=HTMLResponse)
+async def root():
+    """Serve the main HTML page"""
+    with open("static/index.html", "r") as f:
+        return HTMLResponse(content=f.read())
+
+
+@app.get("/auth/status")
+async def auth_status():
+    """Check if Google Calendar is authenticated"""
+    creds = await get_google_credentials()
+    return JSONResponse({
+        "authenticated": creds is not None,
+        "message": "Connected to Google Calendar" if creds else "Not connected"
+    })
+
+
+@app.get("/auth/login")
+async def auth_login():
+    """Initiate Google OAuth flow"""
+    flow = Flow.from_client_config(
+        {
+            "web": {
+                "client_id": GOOGLE_CLIENT_ID,
+                "client_secret": GOOGLE_CLIENT_SECRET,
+                "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+                "token_uri": "https://oauth2.googleapis.com/token",
+                "redirect_uris": [GOOGLE_REDIRECT_URI]
+            }
+        },
+        scopes=SCOPES
+    )
+    flow.redirect_uri = GOOGLE_REDIRECT_URI
+    
+    auth_url, state = flow.authorization_url(
+        access_type='offline',
+        prompt='consent'
+    )
+    
+    return RedirectResponse(url=auth_url)
+
+
+@app.get("/auth/callback")
+async def auth_callback(request: Request):
+    """Handle Google OAuth callback"""
+    code = request.query_params.get("code")
+    error = request.query_params.get("error")
+    
+    if error:
+        return RedirectResponse(url="/?auth=error&message=" + error)
+    
+    if not code:
+        return RedirectResponse(url="/?auth=error&message=no_code")
+    
+    try:
+        flow = Flow.from_client_config(
+            {
+                "web": {
+                    "client_id": GOOGLE_CLIENT_ID,
+                    "client_secret": GOOGLE_CLIENT_SECRET,
+                    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+                    "token_uri": "https://oauth2.googleapis.com/token",
+                    "redirect_uris": [GOOGLE_REDIRECT_URI]
+                }
+            },
+            scopes=SCOPES
+        )
+        flow.redirect_uri = GOOGLE_REDIRECT_URI
+        
+        # Exchange code for tokens using full authorization response URL
+        # This handles scope changes from Google properly
+        authorization_response = str(request.url)
+        flow.fetch_token(authorization_response=authorization_response)
+        creds = flow.credentials
+        
+        # Save credentials
+        await _save_creds_async(creds)
+        _invalidate_auth_cache()
+
+        return RedirectResponse(url="/?auth=success")
+    
+    except Exception as e:
+        return RedirectResponse(url=f"/?auth=error&message={str(e)}")
+
+
+@app.get("/auth/logout")
+async def auth_logout():
+    """Remove Google Calendar authentication"""
+    await asyncio.to_thread(_delete_creds_sync)
+    _invalidate_auth_cache()
+    return RedirectResponse(url="/?auth=logged_out")
+
+
+# ==================== WEBSOCKET ====================
+
+# C-level JSON codec for the relay hot path (bytes in, bytes out)
+_loads = orjson.loads
+_dumps = orjson.dumps
+
+# Audio-delta fast path: route these frames on a substring check instead of
+# a full JSON parse - they dominate the OpenAI->browser message volume
+_AUDIO_DELTA_MARKER = '"type":"response.audio.delta"'
+
+
+async def _send_control(client_ws: WebSocket, payload: dict):
+    """Send a JSON control message as a text frame (binary frames carry raw PCM)"""
+    await client_ws.send_text(_dumps(payload).decode())
+
+
+# Bounded per-direction send queues: a slow peer backs up its queue instead
+# of growing the transport write buffer without limit
+_SEND_QUEUE_MAX = 64
+
+# Control frames wait for the writer at most this long; a peer that can't
+# drain a 64-entry queue in this time is effectively gone, and the
+# TimeoutError tears the session down instead of parking forever
+_CONTROL_PUT_TIMEOUT = 5.0
+
+
+async def _enqueue_frame(queue: asyncio.Queue, frame: tuple, droppable: bool = False):
+    """
+    Queue a frame for a writer task with backpressure rules: when the queue
+    is full, drop the oldest queued audio frame to make room (audio is
+    droppable, stale chunks only add latency); control frames are never
+    dropped and instead wait - bounded by _CONTROL_PUT_TIMEOUT - for the
+    writer to catch up.
+    """
+    try:
+        queue.put_nowait(frame)
+        return
+    except asyncio.QueueFull:
+        pass
+
+    if droppable:
+        # Drain the backlog, evict its oldest audio frame, and put the
+        # rest back unchanged so control frames keep their relative
+        # order; if it is all control traffic, drop this audio frame
+        # instead. No await between the gets and puts, so the writer
+        # cannot observe the queue mid-shuffle.
+        backlog = []
+        try:
+            while True:
+                backlog.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            pass
+        for i, old in enumerate(backlog):
+            if old[0] == "audio":
+                del backlog[i]
+                backlog.append(frame)
+                break
+        for old in backlog:
+            queue.put_nowait(old)
+        return
+
+    await asyncio.wait_for(queue.put(frame), timeout=_CONTROL_PUT_TIMEOUT)
+
+
+# Audio coalescing: hold PCM for up to this long (one upstream delta is
+# ~20ms) so several deltas leave in one frame, and flush early once the
+# pending buffer would exceed this many bytes
+_AUDIO_FLUSH_INTERVAL = 0.015
+_AUDIO_FLUSH_MAX_BYTES = 64 * 1024
+
+
+async def _drain_to_browser(queue: asyncio.Queue, client_ws: WebSocket):
+    """
+    Writer task: forward queued frames to the browser. Consecutive audio
+    frames are coalesced for up to _AUDIO_FLUSH_INTERVAL (or until
+    _AUDIO_FLUSH_MAX_BYTES accumulate) and flushed as one jumbo frame,
+    cutting per-frame WS/TLS/syscall overhead at a cost of <1 frame of
+    added latency. Control frames always flush pending audio first so
+    ordering is preserved.
+    """
+    buf = bytearray()
+    while True:
+        if buf:
+            try:
+                kind, payload = await asyncio.wait_for(
+                    queue.get(), timeout=_AUDIO_FLUSH_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                await client_ws.send_bytes(bytes(buf))
+                buf.clear()
+                continue
+        else:
+            kind, payload = await queue.get()
+
+        if kind == "audio":
+            buf += payload
+            if len(buf) >= _AUDIO_FLUSH_MAX_BYTES:
+                await client_ws.send_bytes(bytes(buf))
+                buf.clear()
+        else:
+            if buf:
+                await client_ws.send_bytes(bytes(buf))
+                buf.clear()
+            await client_ws.send_text(payload)
+
+
+async def _drain_to_openai(queue: asyncio.Queue, openai_ws):
+    """Writer task: forward queued frames to OpenAI.
+
+    Payloads are queued as UTF-8 JSON bytes; the Realtime API accepts
+    only text frames, so the decode happens here at the send boundary.
+    """
+    while True:
+        _, payload = await queue.get()
+        await openai_ws.send_str(payload.decode())
+
+
+def _extract_audio_delta(message: str):
+    """
+    Pull the base64 delta out of a response.audio.delta frame without a full
+    JSON parse. Returns None if the frame doesn't look as expected so the
+    caller can fall back to the normal parse.
+    """
+    start = message.find('"delta":"')
+    if start == -1:
+        return None
+    start += 9  # len('"delta":"')
+    end = message.find('"', start)
+    if end == -1:
+        return None
+    delta = message[start:end]
+    # base64 never needs escaping; a backslash means the assumption broke
+    if '\\' in delta:
+        return None
+    return delta
+
+
+# Outbound append frames are spliced from a prebuilt bytes template, so
+# the browser->OpenAI audio path never runs a JSON serializer
+_APPEND_PREFIX = b'{"type":"input_audio_buffer.append","audio":"'
+_APPEND_SUFFIX = b'"}'
+
+# Legacy base64-in-JSON mic frames, routed on a substring check like the
+# downstream audio deltas
+_CLIENT_AUDIO_MARKER = '"type":"audio"'
+
+
+def _extract_client_audio(message: str):
+    """
+    Pull the base64 payload out of a legacy {"type":"audio",...} mic frame
+    without a full JSON parse. Returns None if the frame doesn't look as
+    expected so the caller can fall back to the normal parse.
+    """
+    start = message.find('"audio":"')
+    if start == -1:
+        return None
+    start += 9  # len('"audio":"')
+    end = message.find('"', start)
+    if end == -1:
+        return None
+    audio = message[start:end]
+    if '\\' in audio:
+        return None
+    return audio
+
+
+# Static parts of the Realtime session config, built once at import; only
+# the CURRENT DATE AND TIME block changes between connects
+_INSTRUCTIONS_TEMPLATE = """You are a friendly voice assistant that helps users schedule calendar meetings.
+
+CURRENT DATE AND TIME:
+- Date: {date}
+- Time: {time}
+- Day: {day}
+- ISO: {iso}
+
+When user says "tomorrow", add 1 day to current date.
+When user says "today", use current date.
+
+YOUR TASK:
+1. Greet the user warmly and introduce yourself as their scheduling assistant
+2. Ask for their name
+3. Ask for the preferred date and time for the meeting
+4. Ask for a meeting title (optional but encouraged)
+5. ALWAYS confirm all the details before creating the event
+6. Only call add_calendar_event AFTER the user confirms the details
+7. After creating the event, confirm success to the user
+
+IMPORTANT RULES:
+- Be conversational and friendly
+- Keep responses concise (this is voice, not text)
+- Always convert relative dates (tomorrow, next Monday) to ISO format using the current date above
+- Confirm before creating any event
+- If the user wants to change something, accommodate them before creating the event"""
+
+_SESSION_TOOLS = [
+    {
+        "type": "function",
+        "name": "add_calendar_event",
+        "description": "Create a new event in the user's Google Calendar. Only call this AFTER confirming all details with the user.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "summary": {
+                    "type": "string",
+                    "description": "The title of the calendar event (meeting title)"
+                },
+                "start_time": {
+                    "type": "string",
+                    "description": "Start time in ISO 8601 format (e.g., 2026-01-15T14:00:00)"
+                },
+                "end_time": {
+                    "type": "string",
+                    "description": "End time in ISO 8601 format. If not specified, defaults to 1 hour after start."
+                },
+                "description": {
+                    "type": "string",
+                    "description": "Optional description for the event"
+                },
+                "attendee_name": {
+                    "type": "string",
+                    "description": "The name of the person scheduling the meeting"
+                }
+            },
+            "required": ["summary", "start_time"]
+        }
+    }
+]
+
+_BASE_SESSION = {
+    "type": "session.update",
+    "session": {
+        "modalities": ["text", "audio"],
+        "instructions": "",  # filled in per connect
+        "voice": "alloy",
+        "input_audio_format": "pcm16",
+        "output_audio_format": "pcm16",
+        "input_audio_transcription": {
+            "model": "whisper-1"
+        },
+        "turn_detection": {
+            "type": "server_vad",
+            "threshold": 0.5,
+            "prefix_padding_ms": 300,
+            "silence_duration_ms": 500
+        },
+        "tools": _SESSION_TOOLS,
+        "tool_choice": "auto"
+    }
+}
+
+
+def get_session_config():
+    """Get the session configuration for OpenAI Realtime API"""
+    current_dt = datetime.now()
+    instructions = _INSTRUCTIONS_TEMPLATE.format(
+        date=current_dt.strftime('%Y-%m-%d'),
+        time=current_dt.strftime('%H:%M:%S'),
+        day=current_dt.strftime('%A'),
+        iso=current_dt.isoformat()
+    )
+    # Shallow-copy so the shared base is never mutated
+    return dict(_BASE_SESSION, session=dict(_BASE_SESSION["session"], instructions=instructions))
+
+
+# The only dynamic part of the session config is the current time, so the
+# serialized blob is cached at minute granularity: within the same minute
+# every connect gets the same precomputed bytes
+_session_config_key = None
+_session_config_bytes = b""
+
+
+def session_config_bytes() -> bytes:
+    """Serialized session.update payload, cached per minute"""
+    global _session_config_key, _session_config_bytes
+    key = int(time.time()) // 60
+    if key != _session_config_key:
+        _session_config_bytes = _dumps(get_session_config())
+        _session_config_key = key
+    return _session_config_bytes
+
+
+def _parse_arguments(arguments: str) -> dict:
+    """Parse tool-call arguments, tolerating malformed JSON"""
+    try:
+        return json.loads(arguments)
+    except json.JSONDecodeError:
+        return {}
+
+
+class AddCalendarEventArgs(BaseModel):
+    """Arguments for the add_calendar_event tool (mirrors _SESSION_TOOLS)"""
+    summary: str = "Meeting"
+    start_time: str | None = None
+    end_time: str | None = None
+    description: str | None = None
+    attendee_name: str | None = None
+
+
+# O(1) dispatch table: tool name -> (argument model, async handler).
+# New tools register here instead of growing an if/elif chain.
+TOOLS = {
+    "add_calendar_event": (AddCalendarEventArgs, add_calendar_event),
+}
+
+
+async def handle_function_call(call_id: str, name: str, arguments: str):
+    """Handle function calls from the assistant"""
+    tool = TOOLS.get(name)
+    if tool is None:
+        return {"error": f"Unknown function: {name}"}
+
+    model_cls, fn = tool
+    try:
+        args = model_cls.model_validate_json(arguments)
+    except ValidationError:
+        # Malformed arguments degrade to the model's defaults; the
+        # handler reports the missing fields back to the assistant
+        args = model_cls()
+    return await fn(**args.model_dump())
+
+
+@app.websocket("/ws")
+async def websocket_endpoint(client_ws: WebSocket):
+    """WebSocket endpoint that relays audio between browser and OpenAI"""
+    await client_ws.accept()
+    
+    if not OPENAI_API_KEY:
+        await _send_control(client_ws, {
+            "type": "error",
+            "message": "OpenAI API key not configured"
+        })
+        await client_ws.close()
+        return
+    
+    # Check Google Calendar auth
+    creds = await get_google_credentials()
+    await _send_control(client_ws, {
+        "type": "auth_status",
+        "authenticated": creds is not None
+    })
+    
+    headers = {
+        "Authorization": f"Bearer {OPENAI_API_KEY}",
+        "OpenAI-Beta": "realtime=v1"
+    }
+    
+    try:
+        http_session = await _get_http_session()
+        # Per-message deflate off and a large message cap: audio frames are
+        # already dense base64 and compression only burns CPU on this path
+        async with http_session.ws_connect(
+            REALTIME_API_URL,
+            headers=headers,
+            heartbeat=20,
+            compress=0,
+            max_msg_size=8 * 1024 * 1024,
+        ) as openai_ws:
+            
+            # Send initial status; "binary" tells the client it may send
+            # raw PCM frames instead of base64-in-JSON
+            await _send_control(client_ws, {
+                "type": "status",
+                "status": "connected",
+                "binary": True,
+                "message": "Connected to OpenAI Realtime API"
+            })
+            
+            # Per-direction bounded queues with dedicated writer tasks
+            browser_q = asyncio.Queue(maxsize=_SEND_QUEUE_MAX)
+            openai_q = asyncio.Queue(maxsize=_SEND_QUEUE_MAX)
+            browser_writer = asyncio.create_task(_drain_to_browser(browser_q, client_ws))
+            openai_writer = asyncio.create_task(_drain_to_openai(openai_q, openai_ws))
+
+            async def send_browser(payload: dict):
+                """Queue a JSON control message for the browser"""
+                await _enqueue_frame(browser_q, ("text", _dumps(payload).decode()))
+
+            async def send_browser_audio(pcm: bytes):
+                """Queue a raw PCM frame for the browser (droppable under pressure)"""
+                await _enqueue_frame(browser_q, ("audio", pcm), droppable=True)
+
+            async def send_openai(payload: bytes, droppable: bool = False):
+                """Queue a frame for OpenAI"""
+                await _enqueue_frame(
+                    openai_q, ("audio" if droppable else "msg", payload), droppable
+                )
+
+            async def relay_to_openai():
+                """Relay messages from browser to OpenAI"""
+                try:
+                    while True:
+                        frame = await client_ws.receive()
+                        if frame.get("type") == "websocket.disconnect":
+                            break
+
+                        raw = frame.get("bytes")
+                        if raw is not None:
+                            # Binary frame = raw PCM16 mic audio; base64 only
+                            # for the OpenAI leg, which requires it. Splicing
+                            # into the bytes template skips JSON entirely
+                            await send_openai(
+                                _APPEND_PREFIX + base64.b64encode(raw) + _APPEND_SUFFIX,
+                                droppable=True
+                            )
+                            continue
+
+                        text = frame.get("text", "{}")
+
+                        # Fast path for legacy base64-in-JSON mic frames:
+                        # lift the payload straight into the append template
+                        if text.find(_CLIENT_AUDIO_MARKER, 0, 40) != -1:
+                            audio = _extract_client_audio(text)
+                            if audio is not None:
+                                await send_openai(
+                                    _APPEND_PREFIX + audio.encode() + _APPEND_SUFFIX,
+                                    droppable=True
+                                )
+                                continue
+
+                        msg = _loads(text)
+
+                        if msg.get("type") == "audio":
+                            # Odd-shaped audio frame the fast path rejected
+                            await send_openai(_dumps({
+                                "type": "input_audio_buffer.append",
+                                "audio": msg.get("audio", "")
+                            }), droppable=True)
+                        elif msg.get("type") == "start":
+                            # Send session config and start response
+                            await send_openai(session_config_bytes())
+                        elif msg.get("type") == "stop":
+                            # Commit current audio buffer
+                            await send_openai(_dumps({
+                                "type": "input_audio_buffer.commit"
+                            }))
+                except WebSocketDisconnect:
+                    pass
+                except Exception as e:
+                    print(f"[Browser->OpenAI Error] {e}")
+            
+            async def relay_to_browser():
+                """Relay messages from OpenAI to browser"""
+                # Function-call items indexed while they stream (by call_id),
+                # and tool executions started before response.done arrives
+                pending_calls = {}
+                call_tasks = {}
+                try:
+                    async for ws_msg in openai_ws:
+                        if ws_msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+                        if ws_msg.type != aiohttp.WSMsgType.TEXT:
+                            continue
+                        message = ws_msg.data
+
+                        # Fast path: forward audio deltas without a full parse
+                        if isinstance(message, str) and message.find(_AUDIO_DELTA_MARKER, 0, 80) != -1:
+                            delta = _extract_audio_delta(message)
+                            if delta is not None:
+                                if delta:
+                                    # Binary frame = raw PCM16, no base64 inflation
+                                    await send_browser_audio(base64.b64decode(delta))
+                                continue
+
+                        event = _loads(message)
+                        event_type = event.get("type", "")
+                        
+                        # Session events
+                        if event_type == "session.created":
+                            await send_browser({
+                                "type": "status",
+                                "status": "ready",
+                                "message": "Session ready"
+                            })
+                        
+                        elif event_type == "session.updated":
+                            # Trigger initial response
+                            await send_openai(_dumps({
+                                "type": "response.create",
+                                "response": {"modalities": ["text", "audio"]}
+                            }))
+                        
+                        # Response events
+                        elif event_type == "response.created":
+                            await send_browser({
+                                "type": "status",
+                                "status": "speaking",
+                                "message": "Assistant speaking"
+                            })
+                        
+                        elif event_type == "response.output_item.added":
+                            item = event.get("item", {})
+                            if item.get("type") == "function_call":
+                                # Index the call as it streams so execution can
+                                # begin before response.done
+                                pending_calls[item.get("call_id")] = {
+                                    "name": item.get("name"),
+                                    "arguments": item.get("arguments") or ""
+                                }
+
+                        elif event_type == "response.function_call_arguments.delta":
+                            call = pending_calls.get(event.get("call_id"))
+                            if call is not None:
+                                call["arguments"] += event.get("delta", "")
+
+                        elif event_type == "response.function_call_arguments.done":
+                            call_id = event.get("call_id")
+                            call = pending_calls.get(call_id)
+                            if call is not None:
+                                arguments = event.get("arguments") or call["arguments"]
+                                # Start the tool call now; the Calendar HTTP
+                                # round-trip overlaps the remaining audio
+                                call_tasks[call_id] = asyncio.create_task(
+                                    handle_function_call(call_id, call["name"], arguments)
+                                )
+
+                        elif event_type == "response.done":
+                            response = event.get("response", {})
+                            output = response.get("output", [])
+
+                            # Check for function calls
+                            function_calls = [
+                                item for item in output
+                                if item.get("type") == "function_call"
+                            ]
+
+                            # Stragglers that never produced streaming events
+                            unstarted = [
+                                fc for fc in function_calls
+                                if fc.get("call_id") not in call_tasks
+                            ]
+                            unstarted_calendar = [
+                                fc for fc in unstarted
+                                if fc.get("name") == "add_calendar_event"
+                            ]
+
+                            # Launch every remaining call before awaiting any
+                            # of them, so independent tools run in parallel
+                            # and the turn is capped by the slowest one
+                            if len(unstarted_calendar) > 1:
+                                # Multiple events in one turn: collapse the
+                                # inserts into a single batched HTTP request
+                                batch_task = asyncio.create_task(
+                                    add_calendar_events_batch([
+                                        _parse_arguments(fc.get("arguments", "{}"))
+                                        for fc in unstarted_calendar
+                                    ])
+                                )
+                                batched_ids = {
+                                    fc.get("call_id") for fc in unstarted_calendar
+                                }
+                            else:
+                                batch_task = None
+                                batched_ids = set()
+
+                            for fc in unstarted:
+                                call_id = fc.get("call_id")
+                                if call_id not in batched_ids:
+                                    call_tasks[call_id] = asyncio.create_task(
+                                        handle_function_call(
+                                            call_id,
+                                            fc.get("name"),
+                                            fc.get("arguments", "{}")
+                                        )
+                                    )
+
+                            batch_results = {}
+                            if batch_task is not None:
+                                results = await batch_task
+                                batch_results = {
+                                    fc.get("call_id"): result
+                                    for fc, result in zip(unstarted_calendar, results)
+                                }
+
+                            turn_tasks = [
+                                call_tasks.pop(fc.get("call_id"))
+                                for fc in function_calls
+                                if fc.get("call_id") in call_tasks
+                            ]
+                            task_results = iter(
+                                await asyncio.gather(*turn_tasks)
+                            ) if turn_tasks else iter(())
+
+                            call_results = []
+                            for fc in function_calls:
+                                call_id = fc.get("call_id")
+                                if call_id in batch_results:
+                                    result = batch_results[call_id]
+                                else:
+                                    result = next(task_results)
+                                pending_calls.pop(call_id, None)
+                                call_results.append((fc, result))
+
+                            for fc, result in call_results:
+                                # Send result to browser
+                                await send_browser({
+                                    "type": "function_result",
+                                    "name": fc.get("name"),
+                                    "result": result
+                                })
+
+                                # Send result back to OpenAI
+                                await send_openai(_dumps({
+                                    "type": "conversation.item.create",
+                                    "item": {
+                                        "type": "function_call_output",
+                                        "call_id": fc.get("call_id"),
+                                        "output": _dumps(result).decode()
+                                    }
+                                }))
+
+                            # Request one acknowledgment response for the turn
+                            if call_results:
+                                await send_openai(_dumps({
+                                    "type": "response.create"
+                                }))
+
+                            await send_browser({
+                                "type": "status",
+                                "status": "listening",
+                                "message": "Listening"
+                            })
+                        
+                        # Audio events
+                        elif event_type == "response.audio.delta":
+                            delta = event.get("delta", "")
+                            if delta:
+                                await send_browser_audio(base64.b64decode(delta))
+                        
+                        # Transcript events
+                        elif event_type == "response.audio_transcript.delta":
+                            transcript = event.get("delta", "")
+                            if transcript:
+                                await send_browser({
+                                    "type": "transcript",
+                                    "role": "assistant",
+                                    "delta": transcript
+                                })
+                        
+                        elif event_type == "response.audio_transcript.done":
+                            transcript = event.get("transcript", "")
+                            await send_browser({
+                                "type": "transcript_done",
+                                "role": "assistant",
+                                "text": transcript
+                            })
+                        
+                        elif event_type == "conversation.item.input_audio_transcription.completed":
+                            transcript = event.get("transcript", "")
+                            if transcript:
+                                await send_browser({
+                                    "type": "transcript_done",
+                                    "role": "user",
+                                    "text": transcript
+                                })
+                        
+                        # Error handling
+                        elif event_type == "error":
+                            error = event.get("error", {})
+                            await send_browser({
+                                "type": "error",
+                                "message": error.get("message", "Unknown error")
+                            })
+                
+                except Exception as e:
+                    print(f"[OpenAI->Browser Error] {e}")
+            
+            # Run both relays; when either finishes (peer hung up), cancel
+            # the sibling immediately instead of letting it keep processing
+            # until its next socket error
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    relay_tasks = (
+                        tg.create_task(relay_to_openai()),
+                        tg.create_task(relay_to_browser()),
+                    )
+                    first_done = asyncio.Event()
+                    for task in relay_tasks:
+                        task.add_done_callback(lambda _: first_done.set())
+                    await first_done.wait()
+                    for task in relay_tasks:
+                        task.cancel()
+            finally:
+                browser_writer.cancel()
+                openai_writer.cancel()
+    
+    except aiohttp.WSServerHandshakeError as e:
+        error_msg = "Failed to connect to OpenAI"
+        if e.status == 401:
+            error_msg = "Invalid OpenAI API key"
+        elif e.status == 429:
+            error_msg = "Rate limited - please wait"
+        # Straight to the socket: send_browser does not exist when the
+        # handshake itself fails, and after an in-session error its
+        # writer task has already been cancelled
+        await _send_control(client_ws, {
+            "type": "error",
+            "message": error_msg
+        })
+    except Exception as e:
+        await _send_control(client_ws, {
+            "type": "error",
+            "message": str(e)
+        })
+    finally:
+        try:
+            await client_ws.close()
+        except:
+            pass
+
+
+# ==================== MAIN ====================
+
+if __name__ == "__main__":
+    import uvicorn
+    port = int(os.environ.get("PORT", 8000))
+    # uvloop + httptools (bundled with uvicorn[standard]) give a C-level
+    # event loop and HTTP parser; the relay tasks are I/O-bound so most
+    # of their time is spent in loop plumbing.
+    #
+    # WEB_CONCURRENCY > 1 shards WS sessions across worker processes for
+    # linear CPU scaling. Session state lives inside one websocket
+    # handler so any worker can serve any new connection, but a fronting
+    # L4 balancer should still use sticky routing (e.g. nginx/HAProxy
+    # `hash $remote_addr consistent`) so a browser reconnect lands on
+    # the same worker. See README "Scaling beyond one core".
+    # Multi-worker mode needs an import string, and "app" would resolve
+    # to the app/ package (which shadows any app.py) - hence this
+    # module's legacy_app name
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    uvicorn.run(
+        "legacy_app:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        workers=workers
+    )
@@ -3,13 +3,16 @@ Migration script to import existing token.pickle to database
 Run this once to migrate from file-based tokens to database storage
 """
 
+import json
 import os
 import pickle
 from datetime import datetime
 
+from google.oauth2.credentials import Credentials
+
 from app.database import init_db, SessionLocal
 from app.models import User
-from app.services.calendar import CalendarService
+from app.services.calendar import CalendarService, SCOPES
 from app.utils.logger import setup_logging, get_logger
 
 setup_logging()
@@ -29,17 +32,31 @@ def migrate_token():
     db = SessionLocal()
     
     try:
-        # Load existing token
+        # Load existing token. Sniff the first byte: every pickle
+        # protocol >= 2 starts with the 0x80 PROTO opcode, while JSON
+        # starts with '{'. A token already written as JSON (or migrated
+        # once before) never goes through the unpickler, which is both
+        # faster and avoids running pickle on a file that may have been
+        # swapped since the original export.
         with open(token_file, 'rb') as f:
-            creds = pickle.load(f)
-        
+            raw = f.read()
+
+        if raw[:1] == b'\x80':
+            creds = pickle.loads(raw)
+        else:
+            creds = Credentials.from_authorized_user_info(json.loads(raw), SCOPES)
+
         logger.info("Found existing token.pickle file")
         
         # Get user email from credentials
         user_email = None
         try:
             from googleapiclient.discovery import build
-            service = build('oauth2', 'v2', credentials=creds)
+            # Bundled discovery document: skips the ~100KB HTTPS fetch
+            service = build(
+                'oauth2', 'v2', credentials=creds,
+                cache_discovery=False, static_discovery=True
+            )
             user_info = service.userinfo().get().execute()
             user_email = user_info.get('email')
             logger.info(f"Retrieved user email: {user_email}")
@@ -47,13 +64,14 @@ def migrate_token():
             logger.warning(f"Could not retrieve user email: {e}")
             user_email = f"migrated_user_{datetime.now().strftime('%Y%m%d_%H%M%S')}@migrated.local"
         
-        # Get or create user
+        # Get or create user. flush() assigns user.id without ending the
+        # transaction, so the user row and the credential update below
+        # land in a single commit (one fsync) inside save_credentials
         user = db.query(User).filter(User.email == user_email).first()
         if not user:
             user = User(email=user_email)
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            db.flush()
             logger.info(f"Created user: {user_email}")
         else:
             logger.info(f"Using existing user: {user_email}")
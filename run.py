@@ -6,6 +6,16 @@ Entry point for running the Voice Scheduling Agent
 import uvicorn
 from app.config import settings
 
+# uvicorn[standard] ships uvloop (libuv event loop) and httptools
+# (C HTTP parser). Requesting them explicitly instead of "auto" makes
+# the fast path deliberate and fails loudly if the standard extra got
+# stripped; uvloop has no Windows build, so fall back there.
+try:
+    import uvloop  # noqa: F401
+    _LOOP = "uvloop"
+except ImportError:
+    _LOOP = "asyncio"
+
 
 def main():
     """Run the application with uvicorn"""
@@ -15,6 +25,8 @@ def main():
         port=settings.port,
         reload=settings.debug,
         log_level=settings.log_level.lower(),
+        loop=_LOOP,
+        http="httptools",
         access_log=False  # We handle logging ourselves
     )
 
@@ -11,6 +11,7 @@ let audioWorkletNode = null;
 let isConnected = false;
 let isListening = false;
 let currentTranscript = '';
+let binaryAudio = false;  // Server supports raw-PCM binary frames
 
 // Audio playback queue
 let audioQueue = [];
@@ -114,6 +115,7 @@ function connectWebSocket() {
     const wsUrl = `${protocol}//${window.location.host}/ws`;
 
     websocket = new WebSocket(wsUrl);
+    websocket.binaryType = 'arraybuffer';
 
     websocket.onopen = () => {
         console.log('WebSocket connected');
@@ -122,6 +124,11 @@ function connectWebSocket() {
     };
 
     websocket.onmessage = (event) => {
+        if (event.data instanceof ArrayBuffer) {
+            // Binary frames carry raw PCM16 audio
+            handlePcmData(event.data);
+            return;
+        }
         const data = JSON.parse(event.data);
         handleServerMessage(data);
     };
@@ -181,6 +188,7 @@ function handleServerMessage(data) {
 function handleStatusUpdate(data) {
     switch (data.status) {
         case 'connected':
+            binaryAudio = data.binary === true;
             updateStatus('idle', 'Connected - Starting session...');
             break;
         case 'ready':
@@ -278,11 +286,16 @@ async function initAudio() {
         audioWorkletNode.port.onmessage = (event) => {
             if (isConnected && isListening) {
                 const audioData = event.data;
-                const base64Audio = arrayBufferToBase64(audioData);
-                websocket.send(JSON.stringify({
-                    type: 'audio',
-                    audio: base64Audio
-                }));
+                if (binaryAudio) {
+                    // Raw PCM16 binary frame - no base64 inflation
+                    websocket.send(audioData);
+                } else {
+                    const base64Audio = arrayBufferToBase64(audioData);
+                    websocket.send(JSON.stringify({
+                        type: 'audio',
+                        audio: base64Audio
+                    }));
+                }
             }
         };
 
@@ -317,10 +330,13 @@ function base64ToArrayBuffer(base64) {
 }
 
 async function handleAudioData(base64Audio) {
+    handlePcmData(base64ToArrayBuffer(base64Audio));
+}
+
+function handlePcmData(audioData) {
     if (!audioContext) return;
 
     try {
-        const audioData = base64ToArrayBuffer(base64Audio);
         const int16Array = new Int16Array(audioData);
 
         // Convert Int16 to Float32
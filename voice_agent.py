@@ -8,17 +8,22 @@ pip install websockets pyaudio google-auth google-auth-oauthlib google-api-pytho
 
 import asyncio
 import base64
+import binascii
 import json
 import pyaudio
 import os
 import pickle
 from datetime import datetime, timedelta
+from functools import lru_cache
 
-# Google Calendar
+import orjson
+
+# Google Calendar. Flow and Request are imported lazily inside
+# authenticate_google: they pull in requests_oauthlib/urllib3 and are
+# only needed when the cached credentials are missing or stale, which
+# the common warm start never hits.
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
 
 import websockets
 
@@ -62,6 +67,121 @@ FORMAT = pyaudio.paInt16
 CHANNELS = 1
 
 
+# Byte template for input_audio_buffer.append: the base64 mic payload
+# is spliced between these halves, skipping a dict build + JSON encode
+# per frame (base64 output never needs escaping)
+_APPEND_PREFIX = b'{"type":"input_audio_buffer.append","audio":"'
+_APPEND_SUFFIX = b'"}'
+
+# Constant envelopes, folded to their wire form once at import
+_RESPONSE_CREATE = '{"type":"response.create"}'
+_INITIAL_RESPONSE_CREATE = (
+    '{"type":"response.create","response":{"modalities":["text","audio"]}}'
+)
+
+
+def _parse_iso(value, default):
+    """Parse an ISO-8601 string, returning default when absent/invalid.
+
+    fromisoformat handles offset-bearing and naive timestamps alike, so
+    no pre-scan of the string is needed; only the 'Z' suffix (which it
+    rejects before Python 3.11) is normalized.
+    """
+    if not isinstance(value, str):
+        return default
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return default
+
+
+# Weekday names indexed by datetime.weekday(), replacing strftime('%A')
+_DAY_NAMES = (
+    'Monday', 'Tuesday', 'Wednesday', 'Thursday',
+    'Friday', 'Saturday', 'Sunday'
+)
+
+# Static parts of the Realtime session config, built once at import.
+# get_session_config only substitutes the current date/time into the
+# instructions; everything else is reused across (re)connects.
+_INSTRUCTIONS_TEMPLATE = """You are a friendly voice assistant that helps users schedule calendar meetings.
+
+CURRENT DATE AND TIME:
+- Date: {date}
+- Time: {time}
+- Day: {day}
+- ISO: {iso}
+
+When user says "tomorrow", add 1 day to current date.
+When user says "today", use current date.
+
+YOUR TASK:
+1. Greet the user warmly and introduce yourself as their scheduling assistant
+2. Ask for their name
+3. Ask for the preferred date and time for the meeting
+4. Ask for a meeting title (optional but encouraged)
+5. ALWAYS confirm all the details before creating the event
+6. Only call add_calendar_event AFTER the user confirms the details
+7. After creating the event, confirm success to the user
+
+IMPORTANT RULES:
+- Be conversational and friendly
+- Keep responses concise (this is voice, not text)
+- Always convert relative dates (tomorrow, next Monday) to ISO format using the current date above
+- Confirm before creating any event
+- If the user wants to change something, accommodate them before creating the event"""
+
+@lru_cache(maxsize=8)
+def _build_instructions(date_s, time_s, day_s, iso_s):
+    """Render the instructions template, memoized on its inputs.
+
+    The caller truncates the timestamp to the minute, so within any one
+    minute repeated (re)connects hit the cache instead of re-rendering.
+    Same scheme as _build_config in app/services/openai_realtime.py.
+    """
+    return _INSTRUCTIONS_TEMPLATE.format_map({
+        "date": date_s,
+        "time": time_s,
+        "day": day_s,
+        "iso": iso_s,
+    })
+
+
+TOOLS = [
+    {
+        "type": "function",
+        "name": "add_calendar_event",
+        "description": "Create a new event in the user's Google Calendar. Only call this AFTER confirming all details with the user.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "summary": {
+                    "type": "string",
+                    "description": "The title of the calendar event (meeting title)"
+                },
+                "start_time": {
+                    "type": "string",
+                    "description": "Start time in ISO 8601 format (e.g., 2026-01-15T14:00:00). Convert relative times to absolute using the current date provided."
+                },
+                "end_time": {
+                    "type": "string",
+                    "description": "End time in ISO 8601 format. If not specified, defaults to 1 hour after start."
+                },
+                "description": {
+                    "type": "string",
+                    "description": "Optional description for the event"
+                },
+                "attendee_name": {
+                    "type": "string",
+                    "description": "The name of the person scheduling the meeting"
+                }
+            },
+            "required": ["summary", "start_time"]
+        }
+    }
+]
+
+
 class VoiceSchedulingAgent:
     def __init__(self):
         self.audio = pyaudio.PyAudio()
@@ -71,25 +191,46 @@ class VoiceSchedulingAgent:
         self.audio_buffer = bytearray()
         self.playback_stream = None
         self.response_in_progress = False
+        # Set by play_audio_chunk whenever audio is buffered; playback
+        # waits on it instead of polling the buffer on a timer
+        self._audio_ready = asyncio.Event()
+        # Wired up by audio_capture_task once the event loop is running
+        self._loop = None
+        self._mic_queue = None
         
     def authenticate_google(self):
         """Authenticate with Google Calendar API"""
         # Allow HTTP for localhost (required for OAuth redirect)
         os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
-        
+
         creds = None
-        token_file = 'token.pickle'
-        
-        # Load existing token if available
+        needs_save = False
+        token_file = 'token.json'
+        legacy_token_file = 'token.pickle'
+
+        # Load existing token if available. Credentials round-trip as
+        # compact JSON (to_json/from_authorized_user_info), which decodes
+        # faster than pickle's opcode VM and avoids unpickling a file an
+        # attacker could have swapped. Older installs still load their
+        # token.pickle once and get rewritten as JSON below.
         if os.path.exists(token_file):
-            with open(token_file, 'rb') as token:
+            with open(token_file, 'r') as token:
+                creds = Credentials.from_authorized_user_info(
+                    json.load(token), SCOPES
+                )
+        elif os.path.exists(legacy_token_file):
+            with open(legacy_token_file, 'rb') as token:
                 creds = pickle.load(token)
+            needs_save = creds is not None  # Re-serialize as JSON
         
-        # If no valid credentials, do OAuth flow
+        # If no valid credentials, do OAuth flow (imports deferred to
+        # here; see the module header)
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
+                from google.auth.transport.requests import Request
                 creds.refresh(Request())
             else:
+                from google_auth_oauthlib.flow import Flow
                 flow = Flow.from_client_config(
                     {
                         "web": {
@@ -113,12 +254,21 @@ class VoiceSchedulingAgent:
                 # Extract authorization code from redirect URL
                 flow.fetch_token(authorization_response=redirect_response)
                 creds = flow.credentials
-            
-            # Save credentials for future use
-            with open(token_file, 'wb') as token:
-                pickle.dump(creds, token)
-        
-        self.calendar_service = build('calendar', 'v3', credentials=creds)
+            needs_save = True
+
+        # Save credentials for future use (JSON; see load above)
+        if needs_save:
+            with open(token_file, 'w') as token:
+                token.write(creds.to_json())
+
+        # static_discovery serves the discovery document from the bundled
+        # copy instead of fetching ~100KB over HTTPS on every startup;
+        # cache_discovery=False silences the deprecated oauth2client
+        # file-cache path
+        self.calendar_service = build(
+            'calendar', 'v3', credentials=creds,
+            cache_discovery=False, static_discovery=True
+        )
         print("Google Calendar authenticated successfully!")
         return True
     
@@ -129,34 +279,10 @@ class VoiceSchedulingAgent:
             return {"error": "Google Calendar not authenticated. Please authenticate first."}
         
         try:
-            # Parse start_time (expecting ISO format)
-            if isinstance(start_time, str):
-                try:
-                    # Handle various ISO format variations
-                    start_time_clean = start_time.replace('Z', '+00:00')
-                    if '+' not in start_time_clean and '-' not in start_time_clean[10:]:
-                        # No timezone info, assume local
-                        start_dt = datetime.fromisoformat(start_time_clean)
-                    else:
-                        start_dt = datetime.fromisoformat(start_time_clean)
-                except Exception:
-                    # If parsing fails, default to 1 hour from now
-                    start_dt = datetime.now() + timedelta(hours=1)
-            else:
-                start_dt = datetime.now() + timedelta(hours=1)
-            
-            # Calculate end time
-            if end_time:
-                try:
-                    end_time_clean = end_time.replace('Z', '+00:00')
-                    if '+' not in end_time_clean and '-' not in end_time_clean[10:]:
-                        end_dt = datetime.fromisoformat(end_time_clean)
-                    else:
-                        end_dt = datetime.fromisoformat(end_time_clean)
-                except Exception:
-                    end_dt = start_dt + timedelta(hours=1)
-            else:
-                end_dt = start_dt + timedelta(hours=1)
+            # Expecting ISO format; fall back to one hour from now for a
+            # missing/malformed start, one hour after start for the end
+            start_dt = _parse_iso(start_time, datetime.now() + timedelta(hours=1))
+            end_dt = _parse_iso(end_time, start_dt + timedelta(hours=1))
             
             # Build description with attendee name if provided
             event_description = description or ""
@@ -193,70 +319,25 @@ class VoiceSchedulingAgent:
             return {"error": f"Failed to create calendar event: {str(e)}"}
     
     def get_session_config(self):
-        """Get the session configuration for OpenAI Realtime API"""
-        current_dt = datetime.now()
-        
-        system_instructions = f"""You are a friendly voice assistant that helps users schedule calendar meetings.
-
-CURRENT DATE AND TIME:
-- Date: {current_dt.strftime('%Y-%m-%d')}
-- Time: {current_dt.strftime('%H:%M:%S')}
-- Day: {current_dt.strftime('%A')}
-- ISO: {current_dt.isoformat()}
+        """Get the session configuration for OpenAI Realtime API
 
-When user says "tomorrow", add 1 day to current date.
-When user says "today", use current date.
+        Only the current date/time is dynamic; the instructions body and
+        the tool schema live in module-level constants so a reconnect
+        only formats one string instead of rebuilding the whole config.
+        """
+        # Truncated to the minute: the prompt does not need second
+        # precision, and it keys the memoized template render so a
+        # reconnect storm formats the instructions once per minute
+        current_dt = datetime.now().replace(second=0, microsecond=0)
 
-YOUR TASK:
-1. Greet the user warmly and introduce yourself as their scheduling assistant
-2. Ask for their name
-3. Ask for the preferred date and time for the meeting
-4. Ask for a meeting title (optional but encouraged)
-5. ALWAYS confirm all the details before creating the event
-6. Only call add_calendar_event AFTER the user confirms the details
-7. After creating the event, confirm success to the user
-
-IMPORTANT RULES:
-- Be conversational and friendly
-- Keep responses concise (this is voice, not text)
-- Always convert relative dates (tomorrow, next Monday) to ISO format using the current date above
-- Confirm before creating any event
-- If the user wants to change something, accommodate them before creating the event"""
+        # One isoformat() provides the date and time fields by slicing
+        # (YYYY-MM-DD at [:10], HH:MM:SS at [11:19]) instead of three
+        # separate strftime format-string parses
+        iso = current_dt.isoformat()
+        system_instructions = _build_instructions(
+            iso[:10], iso[11:19], _DAY_NAMES[current_dt.weekday()], iso
+        )
 
-        tools = [
-            {
-                "type": "function",
-                "name": "add_calendar_event",
-                "description": "Create a new event in the user's Google Calendar. Only call this AFTER confirming all details with the user.",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "summary": {
-                            "type": "string",
-                            "description": "The title of the calendar event (meeting title)"
-                        },
-                        "start_time": {
-                            "type": "string",
-                            "description": "Start time in ISO 8601 format (e.g., 2026-01-15T14:00:00). Convert relative times to absolute using the current date provided."
-                        },
-                        "end_time": {
-                            "type": "string",
-                            "description": "End time in ISO 8601 format. If not specified, defaults to 1 hour after start."
-                        },
-                        "description": {
-                            "type": "string",
-                            "description": "Optional description for the event"
-                        },
-                        "attendee_name": {
-                            "type": "string", 
-                            "description": "The name of the person scheduling the meeting"
-                        }
-                    },
-                    "required": ["summary", "start_time"]
-                }
-            }
-        ]
-        
         return {
             "type": "session.update",
             "session": {
@@ -274,7 +355,7 @@ IMPORTANT RULES:
                     "prefix_padding_ms": 300,
                     "silence_duration_ms": 500
                 },
-                "tools": tools,
+                "tools": TOOLS,
                 "tool_choice": "auto"
             }
         }
@@ -282,19 +363,22 @@ IMPORTANT RULES:
     async def send_audio(self, audio_data: bytes):
         """Send audio data to the Realtime API"""
         if self.ws:
-            audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-            await self.ws.send(json.dumps({
-                "type": "input_audio_buffer.append",
-                "audio": audio_base64
-            }))
+            # Splice the base64 payload into the byte template: no dict
+            # build or JSON encode per mic frame (base64 output never
+            # needs escaping). One decode at the end because the
+            # Realtime API only accepts text frames.
+            await self.ws.send(
+                (_APPEND_PREFIX + base64.b64encode(audio_data)
+                 + _APPEND_SUFFIX).decode()
+            )
     
     async def handle_function_call(self, call_id: str, name: str, arguments: str):
         """Handle function calls from the assistant"""
         print(f"\n[Function Call] {name}")
         
         try:
-            args = json.loads(arguments)
-        except json.JSONDecodeError:
+            args = orjson.loads(arguments)
+        except orjson.JSONDecodeError:
             args = {}
         
         result = None
@@ -311,25 +395,28 @@ IMPORTANT RULES:
             result = {"error": f"Unknown function: {name}"}
         
         # Send function result back to the API
-        await self.ws.send(json.dumps({
+        await self.ws.send(orjson.dumps({
             "type": "conversation.item.create",
             "item": {
                 "type": "function_call_output",
                 "call_id": call_id,
-                "output": json.dumps(result)
+                "output": orjson.dumps(result).decode()
             }
-        }))
-        
+        }).decode())
+
         # Request a response after function execution
-        await self.ws.send(json.dumps({
-            "type": "response.create"
-        }))
+        await self.ws.send(_RESPONSE_CREATE)
     
     async def play_audio_chunk(self, audio_base64: str):
         """Decode and buffer audio for playback"""
         try:
-            audio_data = base64.b64decode(audio_base64)
-            self.audio_buffer.extend(audio_data)
+            # a2b_base64 is what b64decode calls after its own
+            # validation/translation pass; going straight to it skips
+            # that extra walk over every audio delta. extend() copies
+            # into the existing bytearray's spare capacity, so the
+            # decoded bytes are the only per-delta allocation.
+            self.audio_buffer.extend(binascii.a2b_base64(audio_base64))
+            self._audio_ready.set()
         except Exception as e:
             print(f"[Audio Error] {e}")
     
@@ -345,13 +432,25 @@ IMPORTANT RULES:
         
         try:
             while True:
-                if len(self.audio_buffer) >= CHUNK_SIZE * 2:
-                    # Play a chunk
-                    chunk = bytes(self.audio_buffer[:CHUNK_SIZE * 2])
-                    self.audio_buffer = self.audio_buffer[CHUNK_SIZE * 2:]
+                # Sleep until the producer signals buffered audio, then
+                # drain it; no timer polling during the silent stretches
+                # between assistant turns
+                await self._audio_ready.wait()
+
+                # Write every whole chunk that has accumulated in one
+                # call - PortAudio takes arbitrarily sized buffers, so a
+                # burst of deltas costs one write instead of one per
+                # chunk. del shifts the sub-chunk tail in place rather
+                # than reallocating a new bytearray for it.
+                write_len = (len(self.audio_buffer) // (CHUNK_SIZE * 2)) * (CHUNK_SIZE * 2)
+                if write_len:
+                    chunk = bytes(memoryview(self.audio_buffer)[:write_len])
+                    del self.audio_buffer[:write_len]
                     self.playback_stream.write(chunk)
-                else:
-                    await asyncio.sleep(0.01)
+                if len(self.audio_buffer) < CHUNK_SIZE * 2:
+                    # Drained below one chunk: go back to sleep until
+                    # the next delta lands
+                    self._audio_ready.clear()
         except asyncio.CancelledError:
             pass
         finally:
@@ -359,28 +458,46 @@ IMPORTANT RULES:
                 self.playback_stream.stop_stream()
                 self.playback_stream.close()
     
+    def _mic_callback(self, in_data, frame_count, time_info, status):
+        """PortAudio capture callback (runs on the PortAudio thread).
+
+        Hands the frame to the event loop thread-safely; the actual
+        websocket send happens in audio_capture_task. Frames captured
+        while the assistant is speaking are dropped here, before they
+        ever cross threads.
+        """
+        if not self.response_in_progress:
+            self._loop.call_soon_threadsafe(self._mic_queue.put_nowait, in_data)
+        return (None, pyaudio.paContinue)
+
     async def audio_capture_task(self):
-        """Capture audio from microphone and send to API"""
+        """Capture audio from microphone and send to API
+
+        The stream runs in PortAudio's callback (non-blocking) mode:
+        frames arrive at native hardware cadence on PortAudio's thread
+        and are queued to the event loop, instead of a Python loop
+        polling stream.read every 10ms through the scheduler.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._mic_queue = asyncio.Queue()
         stream = self.audio.open(
             format=FORMAT,
             channels=CHANNELS,
             rate=SAMPLE_RATE,
             input=True,
-            frames_per_buffer=CHUNK_SIZE
+            frames_per_buffer=CHUNK_SIZE,
+            stream_callback=self._mic_callback
         )
-        
+
         print("\n🎤 Listening... (Speak into your microphone)")
-        
+
         try:
             while True:
-                # Don't send audio while assistant is speaking
-                if not self.response_in_progress:
-                    try:
-                        audio_data = stream.read(CHUNK_SIZE, exception_on_overflow=False)
-                        await self.send_audio(audio_data)
-                    except Exception as e:
-                        print(f"[Mic Error] {e}")
-                await asyncio.sleep(0.01)
+                audio_data = await self._mic_queue.get()
+                try:
+                    await self.send_audio(audio_data)
+                except Exception as e:
+                    print(f"[Mic Error] {e}")
         except asyncio.CancelledError:
             pass
         finally:
@@ -393,24 +510,19 @@ IMPORTANT RULES:
         
         try:
             async for message in self.ws:
-                event = json.loads(message)
+                event = orjson.loads(message)
                 event_type = event.get("type", "")
                 
                 # Session events
                 if event_type == "session.created":
                     print("[Session] Connected to OpenAI Realtime API")
                     # Send session configuration
-                    await self.ws.send(json.dumps(self.get_session_config()))
+                    await self.ws.send(orjson.dumps(self.get_session_config()).decode())
                 
                 elif event_type == "session.updated":
                     print("[Session] Configuration updated")
                     # Trigger initial response to start conversation
-                    await self.ws.send(json.dumps({
-                        "type": "response.create",
-                        "response": {
-                            "modalities": ["text", "audio"]
-                        }
-                    }))
+                    await self.ws.send(_INITIAL_RESPONSE_CREATE)
                 
                 # Response events
                 elif event_type == "response.created":
@@ -498,30 +610,25 @@ IMPORTANT RULES:
                 ping_timeout=20
             ) as ws:
                 self.ws = ws
-                
-                # Start tasks
-                playback_task = asyncio.create_task(self.audio_playback_task())
-                capture_task = asyncio.create_task(self.audio_capture_task())
-                events_task = asyncio.create_task(self.handle_events())
-                
+
                 print("\n[Ready] Voice agent is active!")
                 print("Press Ctrl+C to stop.\n")
-                
+
                 try:
-                    # Wait for any task to complete (or fail)
-                    done, pending = await asyncio.wait(
-                        [playback_task, capture_task, events_task],
-                        return_when=asyncio.FIRST_COMPLETED
-                    )
-                    
-                    # Cancel remaining tasks
-                    for task in pending:
-                        task.cancel()
-                        try:
-                            await task
-                        except asyncio.CancelledError:
-                            pass
-                            
+                    # Structured concurrency: the audio tasks run as
+                    # children of the group while the event loop is
+                    # driven in the body. When handle_events returns
+                    # (connection closed) the audio tasks are cancelled;
+                    # if anything raises, the group cancels the rest and
+                    # surfaces the error instead of leaving coroutines
+                    # dangling.
+                    async with asyncio.TaskGroup() as tg:
+                        playback_task = tg.create_task(self.audio_playback_task())
+                        capture_task = tg.create_task(self.audio_capture_task())
+                        await self.handle_events()
+                        playback_task.cancel()
+                        capture_task.cancel()
+
                 except asyncio.CancelledError:
                     pass
                     
@@ -554,4 +661,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Prefer the libuv event loop when available (no Windows build);
+    # the asyncio default works fine, just with more per-wakeup overhead
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())